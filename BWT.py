@@ -4,38 +4,251 @@
 """
 This module provides the :class:`BWT` class that facilitates the analysis of big sequences and pattern discovery.
 This class includes diverse strategies, such as:
-	- Building of Burrows-Wheeler matrix that allows the user to a faster analysis of the initial sequence provided
-	- Encountering of patterns
+	- Building of Burrows-Wheeler matrix that allows the user to a faster analysis of the initial sequence provided.
+	  The matrix is not built: the BWT line comes from the suffix array (see SuffixArray) and is stored with the C table and Occ checkpoints (FM-index)
+	- Encountering of patterns (exact, approximate and super-maximal exact matches of reads)
 	- Original sequence faster retrieval
 	- Building of a Suffix Array for match search with the BWT matrix. Faster search is performed with this method 
 """
 
-import re
-import pprint
+import json
+import mmap
+import os
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from RankStructures import RANKS
+from SuffixArray import lcp_array, suffix_array
+
+SA_SAMPLE = 32
+MAGIC = b"BWTIDX2\n"
+
+
+def write_index(path: str, header: dict, parts: list):
+	'''Function that writes an index file (see BWT.save): the magic number, the offset of the header, the sections and the JSON header.
+	The sections of bytes start at an offset that can be mapped on its own, the others are aligned to 8 bytes
+
+	Parameters
+	----------
+	path : str
+		Path of the index file
+	header : dict
+		Fields of the header (the byte order and the position of the sections are added)
+	parts : list
+		Sections (name, typecode, buffers), where each buffer is a bytes-like object or a binary file, copied in chunks from its current position
+	'''
+	sections = {}
+	with open(path, "wb") as handle:
+		handle.write(MAGIC + bytes(8))
+		offset = len(MAGIC) + 8
+		for name, typecode, buffers in parts:
+			offset += -offset % (mmap.ALLOCATIONGRANULARITY if typecode == "B" else 8)
+			handle.seek(offset)
+			size = 0
+			for buffer in buffers:
+				if hasattr(buffer, "read"):
+					for chunk in iter(lambda: buffer.read(1 << 20), b""):
+						size += handle.write(chunk)
+				else:
+					size += handle.write(buffer)
+			sections[name] = [offset, size, typecode]
+			offset += size
+		handle.seek(offset)
+		handle.write(json.dumps({**header, "byteorder": sys.byteorder, "sections": sections}).encode("utf-8"))
+		handle.seek(len(MAGIC))
+		handle.write(offset.to_bytes(8, "little"))
+
 
 class BWT:
-	def __init__(self, seq: str):
+	def __init__(self, seq: str, sa_sample: int = SA_SAMPLE, rank: str = "occ"):
 		'''Initialization of the Burrows-Wheeler matrix construction 
 
 		Parameters
 		----------
 		seq : str
-			Sequence to be the model for BWT matrix
+			Sequence to be the model for BWT matrix. If it has no "$" (end of the sequence), it is added at the end
+		sa_sample : int, optional
+			Sampling rate of the suffix array: only the positions multiple of sa_sample are kept, the others are found with up to sa_sample - 1 LF steps.
+			A smaller rate uses more memory for faster locate queries (1 keeps the whole suffix array), by default 32
+		rank : str, optional
+			Rank structure of the BWT line (see RankStructures): "occ" (checkpoints), "runlength" (runs, for very repetitive sequences)
+			or "wavelet" (wavelet matrix, for big alphabets such as proteins), by default "occ"
+
+		Raises
+		------
+		ValueError
+			If the sequence has more than one "$", or the rank structure is unknown
 		'''
-		self.seq = seq
+		if sa_sample < 1:
+			raise ValueError("The sampling rate of the suffix array must be positive")
+		if rank not in RANKS:
+			raise ValueError(f"Unknown rank structure: {rank}")
+		self._seq = seq
+		self.sa_sample = sa_sample
+		self.rank = rank
 		self._build_BWT()
 
 	def _build_BWT(self):
-		'''Burrows-Wheeler (BWT) matrix construction where the BWT line and Ordered line are defined and joined in a dictionary
+		'''Construction of the FM-index of the sequence: the suffix array, the BWT line (as codes of the alphabet), the C table and the rank structure.
+		The rotations are never built: the rotation ending in "$" is indexed through its suffix array, which gives the same order of the rows
+		'''
+		seq = self._seq
+		if seq.count("$") > 1:
+			raise ValueError("The sequence can only have one \"$\"")
+		k = seq.find("$")
+		if k == -1:
+			text, self._shift = seq + "$", 0
+		else:
+			text, self._shift = seq[k + 1:] + seq[:k + 1], k + 1								# Rotação que termina em "$"
+		self.alphabet = "$" + "".join(sorted(set(text) - {"$"}))
+		self._codes = {c: i for i, c in enumerate(self.alphabet)}
+		codes = text.translate({ord(c): i for c, i in self._codes.items()}).encode("latin-1")
+		self.n = len(codes)
+		sa = suffix_array(codes, len(self.alphabet))
+		bwt = bytes(codes[i - 1] for i in sa)												# Caracter anterior a cada sufixo (a última coluna da matriz)
+		self._sa_rows = array("q", [r for r, p in enumerate(sa) if p % self.sa_sample == 0])	# Linhas amostradas (ordenadas) e respetivas posições
+		self._sa_values = array("q", [sa[r] for r in self._sa_rows])
+		del sa
+		counts = [codes.count(c) for c in range(len(self.alphabet))]
+		self.c_table = [sum(counts[:c]) for c in range(len(self.alphabet) + 1)]				# Nº de caracteres menores que cada caracter
+		self._ranks = RANKS[self.rank](bwt, len(self.alphabet))
+		self._query_codes = self._codes
+		self._maps = ()
+		self.path = None
+		self._reverse = None
+		self._lcp = None
+
+	@property
+	def seq(self) -> str:
+		'''Sequence of the index. For an index loaded from a file it is only rebuilt from the BWT when asked
+
+		Returns
+		-------
+		str
+			Sequence given to the index
+		'''
+		if self._seq is None:
+			text = self._text() + "$"
+			self._seq = text[self.n - self._shift:] + text[:self.n - self._shift] if self._shift else text[:-1]
+		return self._seq
+
+	@property
+	def bwt(self) -> bytes:
+		'''BWT line, as codes of the alphabet (one byte per row)
+
+		Returns
+		-------
+		bytes
+			Last column of the matrix
+		'''
+		return self._ranks.tobytes()
+
+	def _text(self) -> str:
+		'''Auxiliary method that rebuilds the indexed text (without "$") with one LF step per character, starting at the row of "$"'''
+		bwt = bytes(self.bwt)
+		lf = self._lf_array(bwt)
+		codes = bytearray(self.n - 1)
+		r = 0
+		for p in range(self.n - 2, -1, -1):
+			codes[p] = bwt[r]
+			r = lf[r]
+		return codes.decode("latin-1").translate(dict(enumerate(self.alphabet)))
+
+	def _lf_array(self, bwt: bytes) -> array:
+		'''Auxiliary method that computes the LF mapping of every row in a single pass over the BWT line, as an array of integers
+		(4 bytes per row, 8 for sequences over 4 Gb). Only used while the whole text or suffix array is rebuilt'''
+		lf = array("I" if self.n < 1 << 32 else "q", bytes(self.n*(4 if self.n < 1 << 32 else 8)))
+		seen = self.c_table[:-1]														# Próxima linha de cada caracter na primeira coluna
+		for r, c in enumerate(bwt):
+			lf[r] = seen[c]
+			seen[c] += 1
+		return lf
+
+	@property
+	def nbytes(self) -> int:
+		'''Memory used by the structures of the index: rank structure of the BWT line and samples of the suffix array
+
+		Returns
+		-------
+		int
+			Number of bytes of the index
+		'''
+		return self._ranks.nbytes + sum(a.itemsize*len(a) for a in (self._sa_rows, self._sa_values))
+
+	@property
+	def bwt_line(self) -> list:
+		'''BWT line with the current occurrence of each character (e.g. "A3"). Only built when asked
+
+		Returns
+		-------
+		list
+			Last column of the matrix
+		'''
+		return [c + str(i) for c, i in self._numbered(self.bwt)]
+
+	@property
+	def ord_line(self) -> list:
+		'''Ordered line with the current occurrence of each character. Only built when asked
+
+		Returns
+		-------
+		list
+			First column of the matrix
+		'''
+		return [a + str(i) for c, a in enumerate(self.alphabet) for i in range(self.c_table[c + 1] - self.c_table[c])]
+
+	@property
+	def bwt_dic(self) -> dict:
+		'''Dictionary to access more easily to each following member for retrieval of the sequence. Only built when asked
+
+		Returns
+		-------
+		dict
+			Dictionary with the members of the BWT line and of the ordered line
+		'''
+		return {k: v for k, v in zip(self.bwt_line, self.ord_line)}
+
+	def _numbered(self, codes: bytes):
+		'''Auxiliary generator of the characters of a sequence of codes and their current occurrence'''
+		seen = [0]*len(self.alphabet)
+		for c in bytes(codes):
+			yield self.alphabet[c], seen[c]
+			seen[c] += 1
+
+	def _rank(self, c: int, i: int) -> int:
+		'''Auxiliary method that counts the occurrences of the code c in the first i rows of the BWT line, through the rank structure'''
+		return self._ranks.rank(c, i)
+
+	def _lf(self, r: int) -> int:
+		'''Auxiliary method of the LF mapping: row of the suffix that starts one position before the suffix of row r'''
+		c = self._ranks[r]
+		return self.c_table[c] + self._ranks.rank(c, r)
+
+	def _sa_value(self, r: int) -> int:
+		'''Auxiliary method that finds the suffix array value of row r, walking LF steps until a sampled row'''
+		rows = self._sa_rows
+		steps = 0
+		while True:
+			j = bisect_left(rows, r)
+			if j < len(rows) and rows[j] == r:
+				return (self._sa_values[j] + steps) % self.n
+			r = self._lf(r)
+			steps += 1
+
+	@property
+	def combinations(self) -> list:
+		'''Ordered rotations of the sequence and their initial positions. Only built when asked, as they take quadratic memory
+
+		Returns
+		-------
+		list
+			List of tuples with each rotation and its position in the sequence
 		'''
-		self.combinations = sorted([(self.seq[i:] + self.seq[:i], i) for i in range(len(self.seq))])	# Obter todas as sequências ordenadas
-		b, pos = zip(*[(s[-1], p) for s, p in self.combinations])										# Obter apenas último membro das combinações (BWT) e nº de combinação
-		bwt = list(zip(b, pos))
-		fun1 = self._nucl_table()
-		self.bwt_line = [fun1(x) for x in [i[0] for i in bwt]]											# Obter linha BWT com a função _nucl_table que conta cada entrada dos caracteres
-		fun2 = self._nucl_table()
-		self.ord_line = [fun2(x) for x in sorted([i[0] for i in bwt])]
-		self.bwt_dic = {k: v for k, v in zip(self.bwt_line, self.ord_line)}								# Dicionário para aceder + facilmente a cada membro seguinte para recuperação da sequência
+		seq = self.seq if self._shift else self.seq + "$"
+		return [(seq[p:] + seq[:p], p) for p in self.suffixarray()]
 
 	def _nucl_table(self) -> str:
 		'''Auxiliary function that builds a dictionary with the occurences of characters provided to return the current occurrence of each character
@@ -54,22 +267,38 @@ class BWT:
 		return _add
 
 	def original_seq(self) -> str:
-		'''Method that retrieves the original sequence from the BWT matrix built
+		'''Method that retrieves the original sequence from the BWT matrix built, walking the LF mapping (integer array) from the row of "$"
 
 		Returns
 		-------
 		str
 			Original sequence
 		'''
-		l = "$0"
-		s = ''
-		while len(s) != len(self.seq) - 1:
-			s += self.bwt_dic[l][0]
-			l = self.bwt_dic[l]
-		return s
+		return self._text()
+
+	def _interval(self, pat: str) -> tuple:
+		'''Auxiliary method of backward search: starting from the last character of the pattern, each character restricts the interval of rows
+		through the LF mapping (C table and rank), in O(m) steps
+
+		Returns
+		-------
+		tuple
+			Interval [lo, hi) of the rows that start with the pattern (empty if lo == hi)
+		'''
+		lo, hi = 0, self.n
+		for ch in reversed(pat):
+			c = self._query_codes.get(ch)
+			if c is None:
+				return 0, 0
+			lo = self.c_table[c] + self._rank(c, lo)
+			hi = self.c_table[c] + self._rank(c, hi)
+			if lo >= hi:
+				return 0, 0
+		return lo, hi
 
 	def find_pattern(self, pat: str) -> list:
-		'''Method to find a pattern in the BWT matrix built. The algorithm walks through the matrix starting from the last character of the pattern. When reaches the end, the position corresponds to the local of the match of the pattern
+		'''Method to find a pattern in the BWT matrix built. The algorithm walks through the matrix starting from the last character of the pattern (backward search).
+		When reaches the end, the rows of the interval correspond to the matches of the pattern
 		Mathod like "last_to_first"
 
 		Parameters
@@ -80,30 +309,489 @@ class BWT:
 		Returns
 		-------
 		list
-			Positions where the pattern matches
-		'''
-		dic2 = {v: k for k, v in self.bwt_dic.items()}
-		l = [i for i in dic2.keys() if i[0] == pat[-1]]
-		pos = len(pat) - 2
-		while pos != -1:
-			l = [dic2[i] for i in l if dic2[i][0] == pat[pos]]
-			pos -= 1
+			Rows of the matrix that start with the pattern
+		'''
+		return list(range(*self._interval(pat)))
+
+	def count(self, pat: str) -> int:
+		'''Method that counts the occurrences of a pattern, without locating them
+
+		Parameters
+		----------
+		pat : str
+			Pattern to match the BWT matrix
+
+		Returns
+		-------
+		int
+			Number of occurrences of the pattern
+		'''
+		lo, hi = self._interval(pat)
+		return hi - lo
+
+	def locate(self, pat: str) -> list:
+		'''Method that finds the positions of the occurrences of a pattern in the sequence, through the suffix array
+
+		Parameters
+		----------
+		pat : str
+			Pattern to match the BWT matrix
+
+		Returns
+		-------
+		list
+			Ordered positions of the sequence where the pattern starts
+		'''
+		return self._positions(*self._interval(pat))
+
+	def _positions(self, lo: int, hi: int) -> list:
+		'''Auxiliary method that converts an interval of rows into the ordered positions of the sequence'''
+		return sorted(self._position(self._sa_value(r)) for r in range(lo, hi))
+
+	def _position(self, p: int):
+		'''Auxiliary method that converts a position of the indexed text (rotation ending in "$") into the position reported for the sequence'''
+		return (p + self._shift) % self.n
+
+	def _bounds(self, p: int) -> tuple:
+		'''Auxiliary method with the limits [start, end) in the indexed text of the sequence that holds the position p (the whole text, without "$")'''
+		return 0, self.n - 1
+
+	def find_patterns(self, queries, processes: int = None, chunk_size: int = 4096):
+		'''Method to find many patterns at once. The patterns are ordered by their reversed string, so the backward search of consecutive patterns
+		with a common suffix only walks the common suffix once. With several processes, the ordered patterns are split in chunks searched by
+		workers that map the same index file (the file of a loaded index, or a temporary file written by BWT.save)
+
+		Parameters
+		----------
+		queries : iterable
+			Patterns (identified by their order) or tuples (query_id, pattern)
+		processes : int, optional
+			Number of worker processes, by default None (search in this process)
+		chunk_size : int, optional
+			Number of patterns sent to a worker at a time, by default 4096
+
+		Yields
+		------
+		tuple
+			(query_id, positions) of each pattern, in the order of the search (not of the queries)
+		'''
+		items = sorted(((i, q) if isinstance(q, str) else tuple(q) for i, q in enumerate(queries)), key = lambda x: x[1][::-1])
+		if not processes:
+			yield from _search_sorted(self, items)
+			return
+		chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+		with tempfile.TemporaryDirectory() as tmp:
+			path = self.path
+			if path is None:
+				path = os.path.join(tmp, "index.bwt")
+				self.save(path)
+			with ProcessPoolExecutor(processes, initializer = _init_worker, initargs = (type(self), path)) as pool:
+				for res in pool.map(_search_worker, chunks):
+					yield from res
+
+	def _reverse_index(self) -> "BWT":
+		'''Auxiliary method that builds (only once) the index of the reversed sequence, where the backward search of a pattern
+		extends it forwards. Only the rank structures are needed, so its suffix array is sampled at a single position'''
+		if self._reverse is None:
+			self._reverse = BWT(self._text()[::-1] + "$", sa_sample = self.n, rank = self.rank)
+		return self._reverse
+
+	def _lower_bounds(self, pat: str) -> list:
+		'''Auxiliary method that computes the D-array of a pattern: D[i] is a lower bound of the differences of pat[:i+1] to any substring of the sequence,
+		counting how many times the forward search of pat[:i+1] (in the reversed index) fails and restarts'''
+		rev = self._reverse_index()
+		d = []
+		z, lo, hi = 0, 0, rev.n
+		for ch in pat:
+			c = rev._codes.get(ch)
+			if c is not None:
+				lo, hi = rev.c_table[c] + rev._rank(c, lo), rev.c_table[c] + rev._rank(c, hi)
+			if c is None or lo >= hi:
+				z += 1
+				lo, hi = 0, rev.n
+			d.append(z)
+		return d
+
+	def find_approximate(self, pat: str, k: int = 1, mode: str = "hamming") -> list:
+		'''Method to find the occurrences of a pattern with up to k differences. The backward search backtracks over every character of the alphabet,
+		spending one difference per mismatch (and per insertion or deletion in "edit" mode). A branch is abandoned as soon as the differences left
+		are fewer than the lower bound (D-array) of the part of the pattern still to be matched. The occurrences never start nor end with a deletion
+
+		Parameters
+		----------
+		pat : str
+			Pattern to match the BWT matrix
+		k : int, optional
+			Maximum number of differences, by default 1
+		mode : str, optional
+			"hamming" (mismatches only) or "edit" (mismatches, insertions and deletions), by default "hamming"
+
+		Returns
+		-------
+		list
+			Ordered tuples (position, differences) with the start of each occurrence and its smallest number of differences
+
+		Raises
+		------
+		ValueError
+			If the mode is not "hamming" nor "edit"
+		'''
+		if mode not in ("hamming", "edit"):
+			raise ValueError(f"Unknown mode: {mode}")
+		edit = mode == "edit"
+		d = self._lower_bounds(pat)
+		m = len(pat)
+		codes, c_table, rank = self._query_codes, self.c_table, self._rank
+		branch = sorted(c for c in codes.values() if c)
+		best = {}
+		stack = [(m - 1, k, 0, self.n)]													# (posição no padrão, diferenças que restam, intervalo)
+		while stack:
+			i, z, lo, hi = stack.pop()
+			if i < 0:
+				for r in range(lo, hi):
+					if best.get(r, k + 1) > k - z:
+						best[r] = k - z
+				continue
+			if z < d[i]:
+				continue
+			if edit and z:
+				stack.append((i - 1, z - 1, lo, hi))										# Inserção: caracter do padrão que não está na sequência
+			target = codes.get(pat[i])
+			for c in branch:
+				nlo, nhi = c_table[c] + rank(c, lo), c_table[c] + rank(c, hi)
+				if nlo >= nhi:
+					continue
+				if edit and z and i < m - 1:
+					stack.append((i, z - 1, nlo, nhi))										# Deleção: caracter da sequência que não está no padrão
+				if c == target:
+					stack.append((i - 1, z, nlo, nhi))
+				elif z:
+					stack.append((i - 1, z - 1, nlo, nhi))
+		res = {}
+		for r, diff in best.items():
+			if bisect_right(c_table, r) - 1 not in branch:									# Linha que começa por "$" ou separador (todo o padrão inserido)
+				continue
+			p = self._position(self._sa_value(r))
+			if res.get(p, k + 1) > diff:
+				res[p] = diff
+		return sorted(res.items())
+
+	def _extend(self, k: int, l: int, s: int, c: int) -> tuple:
+		'''Auxiliary method of the backward extension of a bi-interval (k, l, s): the rows [k, k+s) of a pattern P and the rows [l, l+s) of P reversed
+		in the index of the reversed sequence, to the ones of cP. In the reversed index, the rows of P reversed followed by c come after the ones followed
+		by a smaller code (or by "$"). The forward extension (Pc) is the backward extension in the reversed index, with k and l swapped'''
+		rank = self._ranks.rank
+		lo, hi = rank(c, k), rank(c, k + s)
+		less = 0
+		for b in range(c):
+			less += rank(b, k + s) - rank(b, k)
+		return self.c_table[c] + lo, l + less, hi - lo
+
+	def _smem_intervals(self, read: str, min_length: int) -> list:
+		'''Auxiliary method with the super-maximal exact matches of the read as tuples (start, end, lo, hi), with the interval of rows of each match.
+		From each start x, the match is extended forwards, keeping the bi-interval of each prefix where the number of occurrences drops (the longest first),
+		and these are then extended backwards together: a bi-interval that can not be extended is a SMEM when no longer one was kept at that step.
+		The search restarts at the end of the longest match from x'''
+		rev = self._reverse_index()
+		c_table = self.c_table
+		q = [self._query_codes.get(ch) or None for ch in read]						# Códigos da leitura (None se não está no índice ou é "$")
+		m = len(read)
 		res = []
-		for i, s in enumerate(self.ord_line):
-			if s in l:
-				res.append(i)
-		return res
+		x = 0
+		while x < m:
+			if q[x] is None:
+				x += 1
+				continue
+			c = q[x]
+			k, l, s, end = c_table[c], c_table[c], c_table[c + 1] - c_table[c], x + 1
+			prev = []																# Bi-intervalos (k, l, s, fim) dos prefixos de read[x:]
+			kept = False
+			for i in range(x + 1, m):
+				if q[i] is None:
+					break
+				nl, nk, ns = rev._extend(l, k, s, q[i])
+				if ns != s:
+					prev.append((k, l, s, end))
+					kept = True
+					if ns == 0:
+						break
+				k, l, s, end, kept = nk, nl, ns, i + 1, False
+			if not kept:
+				prev.append((k, l, s, end))
+			prev.reverse()
+			after = prev[0][3]
+			mems = []
+			for i in range(x - 1, -2, -1):
+				c = q[i] if i >= 0 else None
+				curr = []
+				for k, l, s, end in prev:
+					if c is not None:
+						nk, nl, ns = self._extend(k, l, s, c)
+					if c is None or ns == 0:
+						if not curr and (not mems or i + 1 < mems[-1][0]):			# Sem um match mais longo neste passo
+							mems.append((i + 1, end, k, k + s))
+					elif not curr or ns != curr[-1][2]:
+						curr.append((nk, nl, ns, end))
+				if not curr:
+					break
+				prev = curr
+			res.extend(mem for mem in mems if mem[1] - mem[0] >= min_length)
+			x = after
+		return sorted(res)
+
+	def smems(self, read: str, min_length: int = 19) -> list:
+		'''Method that finds the super-maximal exact matches (SMEMs) of a read, the seeds of read mapping: the exact matches between the read and the sequence
+		that can not be extended to either side and are not contained in another such match. They are found by bidirectional extension of the matches
+		in the FM-index and in the index of the reversed sequence, without searching the substrings of the read one by one
+
+		Parameters
+		----------
+		read : str
+			Query sequence
+		min_length : int, optional
+			Minimum length of the matches, by default 19
+
+		Returns
+		-------
+		list
+			Tuples (start, end, positions) ordered by the start, with the match read[start:end] and the ordered positions of the sequence where it occurs
+		'''
+		return [(start, end, self._positions(lo, hi)) for start, end, lo, hi in self._smem_intervals(read, min_length)]
+
+	def _sa_text(self) -> array:
+		'''Auxiliary method that rebuilds the whole suffix array (positions of the indexed text) with one LF step per position, starting at the row of "$"'''
+		lf = self._lf_array(bytes(self.bwt))
+		sa = array("q", bytes(8*self.n))
+		r = 0
+		for p in range(self.n - 1, -1, -1):
+			sa[r] = p
+			r = lf[r]
+		return sa
 
 	def suffixarray(self) -> tuple:
-		'''Method that constructs the suffix array. Retrieves a list with the initial positions of each ordered suffix
+		'''Method that retrieves the suffix array: a list with the initial positions of each ordered suffix.
+		The complete array is rebuilt from the BWT with one LF step per position, starting at the row of "$"
 
 		Returns
 		-------
 		tuple
 			Tuple of initial positions of each suffix
 		'''
-		d = {}
-		for seq, pos in self.combinations:
-			sufix = re.search(r'.*[^ACTG]', seq)		# Obtém a sequência até o símbolo "$" para adicionar no dicionário
-			d[pos] = sufix.group()
-		return tuple(d.keys())
+		return tuple((p + self._shift) % self.n for p in self._sa_text())
+
+	def _lcp_data(self) -> tuple:
+		'''Auxiliary method that builds (only once) the indexed text, the whole suffix array and the LCP array (Kasai) for the repeat queries'''
+		if self._lcp is None:
+			text = self._text() + "$"
+			sa = self._sa_text()
+			self._lcp = (text, sa, lcp_array(text, sa))
+		return self._lcp
+
+	def lcp(self) -> tuple:
+		'''Method that retrieves the LCP array: the length of the longest common prefix of each ordered suffix with the previous one
+
+		Returns
+		-------
+		tuple
+			Tuple with the LCP of each row (0 for the first)
+		'''
+		return tuple(self._lcp_data()[2])
+
+	def longest_repeat(self) -> tuple:
+		'''Method that finds the longest substring that occurs more than once, from the biggest value of the LCP array
+
+		Returns
+		-------
+		tuple
+			The repeated substring and the ordered list of its positions ("" and an empty list if there is no repeat)
+		'''
+		text, sa, lcp = self._lcp_data()
+		size = max(lcp, default = 0)
+		if size == 0:
+			return "", []
+		r = lcp.index(size)
+		lo, hi = r - 1, r + 1
+		while lo > 0 and lcp[lo] >= size:
+			lo -= 1
+		while hi < self.n and lcp[hi] >= size:
+			hi += 1
+		return text[sa[r]:sa[r] + size], sorted(self._position(sa[i]) for i in range(lo, hi))
+
+	def maximal_repeats(self, min_length: int = 2) -> dict:
+		'''Method that finds the maximal repeats: substrings that occur more than once and whose occurrences can not all be extended by the same character,
+		neither to the right (intervals of the LCP array) nor to the left (different characters in the BWT line of the interval)
+
+		Parameters
+		----------
+		min_length : int, optional
+			Minimum length of the repeats, by default 2
+
+		Returns
+		-------
+		dict
+			Dictionary with each maximal repeat and the ordered list of its positions
+		'''
+		text, sa, lcp = self._lcp_data()
+		bwt = bytes(self.bwt)
+		res = {}
+		stack = [(0, 0)]																# (valor do LCP, início do intervalo)
+		for i in range(1, self.n + 1):
+			cur = lcp[i] if i < self.n else 0
+			lb = i - 1
+			while cur < stack[-1][0]:
+				size, lb = stack.pop()
+				if size >= min_length and self._left_maximal(bwt[lb:i]):
+					res[text[sa[lb]:sa[lb] + size]] = sorted(self._position(sa[r]) for r in range(lb, i))
+			if cur > stack[-1][0]:
+				stack.append((cur, lb))
+		return res
+
+	def _left_maximal(self, chars: bytes) -> bool:
+		'''Auxiliary method that tells if the occurrences of a repeat, preceded by the characters "chars" of the BWT line, can not all be extended to the left'''
+		return len(set(chars)) > 1
+
+	def distinct_substrings(self) -> int:
+		'''Method that counts the distinct (non empty) substrings of the sequence: each suffix adds its prefixes that are not prefixes of the previous suffix
+
+		Returns
+		-------
+		int
+			Number of distinct substrings
+		'''
+		text, sa, lcp = self._lcp_data()
+		return sum(self.n - 1 - p for p in sa) - sum(lcp)
+
+	def save(self, path: str):
+		'''Method that writes the index in a binary file, to be loaded (mapped) by BWT.load.
+		The file has the sections of the rank structure (e.g. the BWT line, packed in 2 bits per row for DNA, and the Occ checkpoints) and the samples of the suffix array,
+		followed by a JSON header with the alphabet, the C table and the position of each section. The sections of bytes start at an offset that can be mapped on its own
+
+		Parameters
+		----------
+		path : str
+			Path of the index file
+		'''
+		params, parts = self._ranks._sections()
+		extra, extra_parts = self._file_parts()
+		parts = parts + [("sa_rows", "q", [self._sa_rows]), ("sa_values", "q", [self._sa_values])] + extra_parts
+		header = {"alphabet": self.alphabet, "n": self.n, "shift": self._shift, "sa_sample": self.sa_sample, "c_table": self.c_table,
+				  "rank": self.rank, "rank_params": params, **extra}
+		write_index(path, header, parts)
+
+	@classmethod
+	def load(cls, path: str) -> "BWT":
+		'''Method that maps an index file written by BWT.save. Nothing is rebuilt or copied: the structures are views over the mapped file
+		(the sections of bytes are mapped on their own), so several processes loading the same file share its pages
+
+		Parameters
+		----------
+		path : str
+			Path of the index file
+
+		Returns
+		-------
+		BWT
+			Index mapped from the file
+
+		Raises
+		------
+		ValueError
+			If the file is not a BWT index or was written in a machine with another byte order
+		'''
+		with open(path, "rb") as handle:
+			mm = mmap.mmap(handle.fileno(), 0, access = mmap.ACCESS_READ)
+			if mm[:len(MAGIC)] != MAGIC:
+				mm.close()
+				raise ValueError(f"{path} is not a BWT index file")
+			header = json.loads(mm[int.from_bytes(mm[len(MAGIC):len(MAGIC) + 8], "little"):].decode("utf-8"))
+			if header["byteorder"] != sys.byteorder:
+				mm.close()
+				raise ValueError(f"{path} was written with {header['byteorder']} byte order")
+			maps, views = [mm], {}
+			view = memoryview(mm)
+			for name, (offset, size, typecode) in header["sections"].items():
+				if typecode == "B":
+					maps.append(mmap.mmap(handle.fileno(), size, offset = offset, access = mmap.ACCESS_READ))
+					views[name] = maps[-1]
+				else:
+					views[name] = view[offset:offset + size].cast(typecode)
+		self = cls.__new__(cls)
+		self._seq = None
+		self.path = path
+		self._reverse = None
+		self._lcp = None
+		self.alphabet = header["alphabet"]
+		self._codes = {c: i for i, c in enumerate(self.alphabet)}
+		self.n, self._shift, self.sa_sample, self.c_table = header["n"], header["shift"], header["sa_sample"], header["c_table"]
+		self.rank = header["rank"]
+		self._ranks = RANKS[self.rank]._from_sections(header["rank_params"], views)
+		self._sa_rows, self._sa_values = views["sa_rows"], views["sa_values"]
+		self._query_codes = self._codes
+		self._views = [view] + [v for v in views.values() if isinstance(v, memoryview)]
+		self._maps = tuple(maps)
+		self._load_parts(header, views)
+		return self
+
+	def _file_parts(self) -> tuple:
+		'''Auxiliary method with the extra fields of the header and sections (name, typecode, buffers) written by the subclasses in an index file'''
+		return {}, []
+
+	def _load_parts(self, header: dict, views: dict):
+		'''Auxiliary method where the subclasses read their extra fields and sections of a mapped index file'''
+		pass
+
+	def close(self):
+		'''Method that unmaps the file of an index loaded by BWT.load (nothing is done for an index built in memory)
+		'''
+		if not self._maps:
+			return
+		self._ranks = self._sa_rows = self._sa_values = None									# Largar as vistas sobre o ficheiro antes de o fechar
+		for v in reversed(self._views):
+			v.release()
+		for m in self._maps:
+			m.close()
+		self._views, self._maps = [], ()
+
+	def __enter__(self) -> "BWT":
+		return self
+
+	def __exit__(self, *args):
+		self.close()
+
+
+def _search_sorted(index: BWT, items: list):
+	'''Auxiliary generator of the backward search of patterns ordered by their reversed string. The intervals of the previous pattern are kept
+	for each length of its suffix, so the search of each pattern starts after the suffix it shares with the previous one'''
+	codes, c_table, rank = index._query_codes, index.c_table, index._rank
+	prev = ""
+	stack = [(0, index.n)]															# Intervalo depois de cada nº de caracteres do sufixo
+	for qid, pat in items:
+		rev = pat[::-1]
+		common = 0
+		for a, b in zip(prev, rev):
+			if a != b:
+				break
+			common += 1
+		del stack[common + 1:]
+		lo, hi = stack[-1]
+		for ch in islice(rev, len(stack) - 1, None):
+			c = codes.get(ch)
+			if c is None or lo >= hi:
+				lo = hi = 0
+			else:
+				lo, hi = c_table[c] + rank(c, lo), c_table[c] + rank(c, hi)
+			stack.append((lo, hi))
+		prev = rev
+		yield qid, index._positions(lo, hi) if lo < hi else []
+
+
+_INDEX = None
+
+def _init_worker(cls: type, path: str):
+	'''Auxiliary function that maps the index file (of the class of the index, e.g. MultiBWT) in each worker process'''
+	global _INDEX
+	_INDEX = cls.load(path)
+
+def _search_worker(items: list) -> list:
+	'''Auxiliary function (run in the workers) that searches a chunk of ordered patterns'''
+	return list(_search_sorted(_INDEX, items))
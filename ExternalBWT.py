@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright 2022 by Group 7 (MSc Bioinformatics - University of Minho).  All rights reserved.
+
+"""
+This module provides the construction of a :class:`BWT` index for sequences larger than the memory, written straight into an index file (see BWT.save).
+Only bounded parts of the sequence are kept in memory, the rest lives in temporary files on disk:
+	- The sequence is streamed from a flat or FASTA file and written as codes of the alphabet in a file, which is mapped (the text)
+	- The suffixes are distributed by their first symbols into buckets (files of positions), in one pass over the text
+	- Each bucket is sorted on its own, comparing slices of the mapped text. A bucket with more suffixes than the memory cap allows
+	  (e.g. the suffixes of a long repeat) is sorted in runs written on disk, which are merged
+	- The buckets follow the order of their prefixes, so their partial BWT lines and suffix array samples are just concatenated
+	- The Occ checkpoints are counted over the BWT line in chunks, where the line is also packed in 2 bits per row for DNA (see OccRank)
+The index has the Occ checkpoints as rank structure and the same content as the one built in memory, so it is mapped with BWT.load.
+"""
+
+import heapq
+import mmap
+import os
+import sys
+import tempfile
+from array import array
+from functools import cmp_to_key
+from itertools import chain, islice
+from BWT import BWT, SA_SAMPLE, write_index
+from RankStructures import OCC_STEP, _pack
+from SeqReader import _iter_lines
+
+try:
+	import resource
+except ImportError:																	# Windows
+	resource = None
+
+MEMORY = 1 << 28
+SUFFIX_BYTES = 128																	# Memória estimada por sufixo a ordenar (posição, chave e listas)
+CHUNK_SIZE = 1 << 20
+MAX_BUCKETS = 1 << 12
+MAX_SLICE = 1 << 16
+
+
+def peak_memory() -> int:
+	'''Peak resident memory of the process, in bytes (None if it is not available in the platform)'''
+	if resource is None:
+		return None
+	peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	return peak if sys.platform == "darwin" else peak*1024						# Linux em KiB, macOS em bytes
+
+
+def _read_text(source: str, path: str, report) -> tuple:
+	'''Auxiliary function that writes the sequence of a flat or FASTA file (one record) in the file "path" as codes of the alphabet, followed by the sentinel.
+	Returns the alphabet and the number of occurrences of each code'''
+	with open(source, "rb") as handle:
+		compressed = handle.read(2) == b"\x1f\x8b"
+	total = None if compressed else os.path.getsize(source)							# Tamanho descomprimido desconhecido
+	done = reported = 0
+	seen = set()
+	with open(path, "wb") as out:
+		for line in _iter_lines(source, CHUNK_SIZE):
+			done += len(line) + 1
+			if line.startswith(">"):
+				if out.tell():
+					raise ValueError("Only single record files are supported")
+				continue
+			line = line.strip().upper().encode("latin-1")
+			seen.update(line)
+			out.write(line)
+			if done - reported >= CHUNK_SIZE:
+				report("read", done, total)
+				reported = done
+	if ord("$") in seen:
+		raise ValueError("The sequence can not have \"$\" (the sentinel is added at the end)")
+	alphabet = "$" + "".join(sorted(chr(c) for c in seen))
+	table = bytes(alphabet.find(chr(c)) % 256 for c in range(256))
+	counts = [1] + [0]*(len(alphabet) - 1)
+	with open(path, "r+b") as handle:												# Caracteres traduzidos para códigos no próprio ficheiro
+		while True:
+			offset = handle.tell()
+			chunk = handle.read(CHUNK_SIZE).translate(table)
+			if not chunk:
+				break
+			for c in range(1, len(alphabet)):
+				counts[c] += chunk.count(c)
+			handle.seek(offset)
+			handle.write(chunk)
+		handle.write(b"\x00")
+	report("read", done if total is None else total, total)
+	return alphabet, counts
+
+
+def _distribute(text, sigma: int, q: int, folder: str, memory: int, report) -> list:
+	'''Auxiliary function that writes the positions of the suffixes in one file per prefix of q symbols, keeping up to "memory" bytes of positions in buffers.
+	Returns the (path, size) of the non empty buckets, in the order of the prefixes'''
+	n = len(text)
+	mod = sigma**q
+	buffers, sizes = {}, {}
+	pending = 0
+
+	def flush():
+		for code, buffer in buffers.items():
+			with open(os.path.join(folder, str(code)), "ab") as handle:
+				buffer.tofile(handle)
+			sizes[code] = sizes.get(code, 0) + len(buffer)
+		buffers.clear()
+
+	key = 0
+	for c in text[:q - 1]:
+		key = key*sigma + c
+	p = 0
+	stream = chain((text[i:i + CHUNK_SIZE] for i in range(q - 1, n, CHUNK_SIZE)), [bytes(q - 1)])	# Último símbolo de cada prefixo
+	for chunk in stream:
+		for c in chunk:
+			key = (key*sigma + c) % mod
+			buffer = buffers.get(key)
+			if buffer is None:
+				buffer = buffers[key] = array("q")
+			buffer.append(p)
+			p += 1
+		pending += 8*len(chunk)
+		if pending >= memory:
+			flush()
+			pending = 0
+		report("distribute", p, n)
+	flush()
+	return [(os.path.join(folder, str(code)), sizes[code]) for code in sorted(sizes)]
+
+
+def _sort_positions(text, positions, depth: int, budget: int) -> list:
+	'''Auxiliary function that sorts suffixes which share their first "depth" symbols by slices of the mapped text. The groups still tied are sorted
+	again by the next slices (only a slice ending in the sentinel can be shorter, and it is unique), of twice the length while the slices of the group
+	fit in "budget" bytes'''
+	res = list(positions)
+	stack = [(0, len(res), depth, 32)]												# Grupos empatados: início, fim, profundidade e comprimento das fatias
+	while stack:
+		s, e, d, length = stack.pop()
+		res[s:e] = sorted(res[s:e], key = lambda p: text[p + d:p + d + length])
+		i = s
+		while i < e:
+			key = text[res[i] + d:res[i] + d + length]
+			j = i + 1
+			while j < e and text[res[j] + d:res[j] + d + length] == key:
+				j += 1
+			if j - i > 1:
+				stack.append((i, j, d + length, max(32, min(2*length, budget // (j - i)))))
+			i = j
+	return res
+
+
+def _compare(text, depth: int):
+	'''Auxiliary function with the comparison of two suffixes that share their first "depth" symbols, by slices of the mapped text of doubling length'''
+	def compare(a: int, b: int) -> int:
+		a, b, length = a + depth, b + depth, 32
+		while True:
+			x, y = text[a:a + length], text[b:b + length]
+			if x != y:
+				return -1 if x < y else 1
+			a, b, length = a + length, b + length, min(2*length, MAX_SLICE)
+	return compare
+
+
+def _read_run(path: str, block: int):
+	'''Auxiliary generator of the positions of a file, read in blocks'''
+	with open(path, "rb") as handle:
+		while True:
+			positions = array("q")
+			try:
+				positions.fromfile(handle, block)
+			except EOFError:															# Último bloco (incompleto) já lido
+				pass
+			if not positions:
+				break
+			yield from positions
+
+
+def _sort_bucket(text, path: str, size: int, depth: int, cap: int):
+	'''Auxiliary generator of the sorted positions of a bucket whose suffixes share their first "depth" symbols, in lists of up to "cap" positions.
+	A bucket with more than "cap" suffixes (e.g. a long repeat) is sorted in runs of "cap" suffixes written on disk, which are then merged'''
+	if size <= cap:
+		positions = array("q")
+		with open(path, "rb") as handle:
+			positions.fromfile(handle, size)
+		os.remove(path)
+		yield _sort_positions(text, positions, depth, cap*SUFFIX_BYTES // 4)
+		return
+	runs = []
+	with open(path, "rb") as handle:
+		for start in range(0, size, cap):
+			positions = array("q")
+			positions.fromfile(handle, min(cap, size - start))
+			runs.append(f"{path}.{len(runs)}")
+			with open(runs[-1], "wb") as out:
+				array("q", _sort_positions(text, positions, depth, cap*SUFFIX_BYTES // 4)).tofile(out)
+			del positions
+	os.remove(path)
+	block = max(1, cap // len(runs))
+	merged = heapq.merge(*[_read_run(run, block) for run in runs], key = cmp_to_key(_compare(text, depth)))
+	while True:
+		positions = list(islice(merged, cap))
+		if not positions:
+			break
+		yield positions
+	for run in runs:
+		os.remove(run)
+
+
+def build_index(source: str, path: str, memory: int = MEMORY, sa_sample: int = SA_SAMPLE, progress = None, tmpdir: str = None) -> BWT:
+	'''Construction of the FM-index of the sequence of a file under a memory cap, written in the index file "path" and mapped at the end
+
+	Parameters
+	----------
+	source : str
+		Path of the flat or FASTA file (one record, possibly compressed with gzip) with the sequence, without "$"
+	path : str
+		Path of the index file
+	memory : int, optional
+		Memory cap, in bytes, for the suffixes sorted at a time and the buffers of positions, by default 256 MiB.
+		The text and the temporary files (about 9 bytes per character) are on disk, the operating system keeps in cache the pages it can.
+		The suffixes are compared by slices of the text, so the time grows with the length of the repeats: for very long exact repeats
+		(e.g. long tandem repeats) the construction in memory, by prefix doubling, is much faster
+	sa_sample : int, optional
+		Sampling rate of the suffix array (see BWT), by default 32
+	progress : callable, optional
+		Function called as progress(stage, processed, total, peak) along the construction, with the stage ("read", "distribute", "sort" or "occ"),
+		the bytes processed in the stage out of the total (None for the reading of a gzip file, whose uncompressed size is unknown)
+		and the current peak memory of the process in bytes (None if not available), by default None
+	tmpdir : str, optional
+		Directory of the temporary files, by default the one of the system
+
+	Returns
+	-------
+	BWT
+		Index mapped from the file
+
+	Raises
+	------
+	ValueError
+		If the file has more than one record or a "$", or the memory cap or the sampling rate are not positive
+	'''
+	if memory < 1 or sa_sample < 1:
+		raise ValueError("The memory cap and the sampling rate of the suffix array must be positive")
+
+	def report(stage, done, total):
+		if progress is not None:
+			progress(stage, done, total, peak_memory())
+
+	cap = max(1, memory // SUFFIX_BYTES)												# Nº máximo de sufixos ordenados de cada vez
+	with tempfile.TemporaryDirectory(dir = tmpdir) as folder:
+		text_path = os.path.join(folder, "text")
+		alphabet, counts = _read_text(source, text_path, report)
+		sigma = len(alphabet)
+		n = sum(counts)
+		q = 1
+		while sigma**(q + 1) <= MAX_BUCKETS and sigma**q < 4*n // cap:
+			q += 1
+		with open(text_path, "rb") as handle:
+			mm = mmap.mmap(handle.fileno(), 0, access = mmap.ACCESS_READ)
+		try:
+			buckets = _distribute(mm, sigma, q, folder, memory, report)
+			files = {name: open(os.path.join(folder, name), "w+b") for name in ("bwt", "sa_rows", "sa_values")}
+			row = 0
+			for bucket, size in buckets:
+				for positions in _sort_bucket(mm, bucket, size, q, cap):
+					files["bwt"].write(bytes(mm[p - 1] for p in positions))			# Caracter anterior a cada sufixo (mm[-1] é o sentinela)
+					samples = [(row + r, p) for r, p in enumerate(positions) if p % sa_sample == 0]
+					array("q", [r for r, _ in samples]).tofile(files["sa_rows"])
+					array("q", [p for _, p in samples]).tofile(files["sa_values"])
+					row += len(positions)
+					report("sort", row, n)
+		finally:
+			mm.close()
+
+		occ = [open(os.path.join(folder, f"occ{c}"), "w+b") for c in range(sigma)]
+		acc = [0]*sigma
+		for c in range(sigma):
+			array("q", [0]).tofile(occ[c])
+		bwt = files["bwt"]
+		bwt.seek(0)
+		packed = sigma <= 5																# Linha em 2 bits por linha, como em OccRank
+		if packed:
+			files["packed"] = open(os.path.join(folder, "packed"), "w+b")
+			dollar = n
+		done = 0
+		while True:
+			chunk = bwt.read(OCC_STEP*(CHUNK_SIZE // OCC_STEP))
+			if not chunk:
+				break
+			if packed:
+				files["packed"].write(_pack(chunk))
+				if chunk.find(0) != -1:
+					dollar = done + chunk.find(0)
+			for c in range(sigma):
+				checkpoints = array("q")
+				for b in range(0, len(chunk), OCC_STEP):
+					acc[c] += chunk.count(c, b, b + OCC_STEP)
+					checkpoints.append(acc[c])
+				checkpoints.tofile(occ[c])
+			done += len(chunk)
+			report("occ", done, n)
+
+		for handle in chain(files.values(), occ):
+			handle.seek(0)
+		params = {"sigma": sigma, "step": OCC_STEP, "n": n, "packed": packed}
+		if packed:
+			params["dollar"] = dollar
+		header = {"alphabet": alphabet, "n": n, "shift": 0, "sa_sample": sa_sample, "c_table": [sum(counts[:c]) for c in range(sigma + 1)],
+				  "rank": "occ", "rank_params": params}
+		try:
+			write_index(path, header, [("bwt", "B", [files["packed"] if packed else bwt]), ("occ", "q", occ), ("sa_rows", "q", [files["sa_rows"]]), ("sa_values", "q", [files["sa_values"]])])
+		finally:
+			for handle in chain(files.values(), occ):
+				handle.close()
+	return BWT.load(path)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright 2022 by Group 7 (MSc Bioinformatics - University of Minho).  All rights reserved.
+
+"""
+This module provides the :class:`GeneticCode` class, a precompiled codon lookup used to translate DNA sequences.
+Each genetic code is compiled once into:
+    - A dictionary with the 64 codons and the corresponding amino acid, used to translate whole reading frames in bulk
+    - A 64 character string indexed by the integer code of the codon (A=0, C=1, G=2, T=3 and codon = 16*b1 + 4*b2 + b3)
+The alternative NCBI genetic codes are available through their NCBI identifier (see :func:`get_code`).
+"""
+
+from functools import lru_cache
+
+BASES = "ACGT"
+
+# Amino acids of each NCBI translation table, with the codons in the NCBI "TCAG" order and the stop codons as "*"
+NCBI_TABLES = {
+    1: ("Standard", "FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG"),
+    2: ("Vertebrate Mitochondrial", "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNKKSS**VVVVAAAADDEEGGGG"),
+    3: ("Yeast Mitochondrial", "FFLLSSSSYY**CCWWTTTTPPPPHHQQRRRRIIMMTTTTNNKKSSRRVVVVAAAADDEEGGGG"),
+    4: ("Mold, Protozoan, and Coelenterate Mitochondrial and Mycoplasma/Spiroplasma", "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG"),
+    5: ("Invertebrate Mitochondrial", "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNKKSSSSVVVVAAAADDEEGGGG"),
+    6: ("Ciliate, Dasycladacean and Hexamita Nuclear", "FFLLSSSSYYQQCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG"),
+    9: ("Echinoderm and Flatworm Mitochondrial", "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNNKSSSSVVVVAAAADDEEGGGG"),
+    10: ("Euplotid Nuclear", "FFLLSSSSYY**CCCWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG"),
+    11: ("Bacterial, Archaeal and Plant Plastid", "FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG"),
+    12: ("Alternative Yeast Nuclear", "FFLLSSSSYY**CC*WLLLSPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG"),
+    13: ("Ascidian Mitochondrial", "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNKKSSGGVVVVAAAADDEEGGGG"),
+    14: ("Alternative Flatworm Mitochondrial", "FFLLSSSSYYY*CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNNKSSSSVVVVAAAADDEEGGGG"),
+    16: ("Chlorophycean Mitochondrial", "FFLLSSSSYY*LCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG"),
+    21: ("Trematode Mitochondrial", "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNNKSSSSVVVVAAAADDEEGGGG"),
+    22: ("Scenedesmus obliquus Mitochondrial", "FFLLSS*SYY*LCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG"),
+    23: ("Thraustochytrium Mitochondrial", "FF*LSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG"),
+    24: ("Rhabdopleuridae Mitochondrial", "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSSKVVVVAAAADDEEGGGG"),
+    25: ("Candidate Division SR1 and Gracilibacteria", "FFLLSSSSYY**CCGWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG"),
+    26: ("Pachysolen tannophilus Nuclear", "FFLLSSSSYY**CC*WLLLAPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG"),
+}
+
+
+class GeneticCode:
+    def __init__(self, table_id: int = 1) -> None:
+        '''Compilation of the NCBI translation table given into a 64 entries codon lookup
+
+        Parameters
+        ----------
+        table_id : int, optional
+            NCBI identifier of the genetic code, by default 1 (Standard)
+
+        Raises
+        ------
+        ValueError
+            If the identifier given is not a known NCBI translation table
+        '''
+        if table_id not in NCBI_TABLES:
+            raise ValueError(f"Unknown genetic code: {table_id}")
+        self.table_id = table_id
+        self.name, ncbi = NCBI_TABLES[table_id]
+        ncbi_order = "TCAG"
+        self.codons = {}
+        table = []
+        for b1 in BASES:
+            for b2 in BASES:
+                for b3 in BASES:
+                    idx = 16*ncbi_order.index(b1) + 4*ncbi_order.index(b2) + ncbi_order.index(b3)
+                    amino = ncbi[idx].replace("*", "_")
+                    self.codons[b1 + b2 + b3] = amino
+                    table.append(amino)
+        self.table = "".join(table)
+
+    def __str__(self) -> str:
+        '''Writing the identifier and name of the genetic code
+
+        Returns
+        ------------
+        str
+            String with the information of the object
+        '''
+        return f"{self.table_id}:{self.name}"
+
+    def stops(self) -> list:
+        '''Obtaining of the stop codons of the genetic code
+
+        Returns
+        ------------
+        list
+            List with the stop codons
+        '''
+        return [c for c, a in self.codons.items() if a == "_"]
+
+    def translate(self, seq: str, frame: int = 0, unknown: str = "") -> str:
+        '''Translation of a whole reading frame of a DNA sequence in a single pass over its codons
+        Codons with characters outside "ACGT" (e.g. gaps) are replaced by "unknown" (skipped by default). The incomplete codon at the end is ignored
+
+        Parameters
+        ----------
+        seq : str
+            Uppercase DNA sequence
+        frame : int, optional
+            Offset of the first codon (0, 1 or 2), by default 0
+        unknown : str, optional
+            Replacement of the codons that are not in the table, by default ""
+
+        Returns
+        ------------
+        str
+            Amino acid chain of the reading frame
+        '''
+        get = self.codons.get
+        return "".join([get(seq[i:i+3], unknown) for i in range(frame, len(seq) - 2, 3)])
+
+    def translate_codes(self, codes) -> str:
+        '''Translation of integer coded codons (16*b1 + 4*b2 + b3, with A=0, C=1, G=2, T=3)
+
+        Parameters
+        ----------
+        codes : iterable
+            Integer codes of the codons, between 0 and 63
+
+        Returns
+        ------------
+        str
+            Amino acid chain of the codons
+        '''
+        return "".join(map(self.table.__getitem__, codes))
+
+
+@lru_cache(maxsize=None)
+def get_code(table_id: int = 1) -> GeneticCode:
+    '''Obtaining of the precompiled genetic code of a NCBI translation table. Each table is only compiled once
+
+    Parameters
+    ----------
+    table_id : int, optional
+        NCBI identifier of the genetic code, by default 1 (Standard)
+
+    Returns
+    -------
+    GeneticCode
+        Precompiled genetic code
+    '''
+    return GeneticCode(table_id)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright 2022 by Group 7 (MSc Bioinformatics - University of Minho).  All rights reserved.
+
+"""
+This module provides the k-mer engine used by :class:`Sequence`, based on the 2 bits coding of the bases (A=0, C=1, G=2, T/U=3).
+Each k-mer (k up to 31) is a 64 bits integer updated with a rolling shift, instead of slicing the sequence:
+    - iter_kmers(): yields the integer code of every k-mer, optionally canonical (the smallest between the k-mer and its inverse complement)
+    - kmer_counts(): counts the k-mers in a hash table (dictionary)
+    - decode_kmer(): converts a code back into the k-mer string, for the graph and motif modules
+The k-mers with characters other than the bases (e.g. gaps) are skipped.
+"""
+
+from collections import Counter
+
+MAX_K = 31
+_BASE_CODES = {"A": 0, "C": 1, "G": 2, "T": 3, "U": 3}
+_TABLE = bytes(_BASE_CODES.get(chr(c).upper(), 4) for c in range(256))
+
+
+def _encode(seq) -> bytes:
+    '''Auxiliary function that converts the bases into their codes (0 to 3) and any other character into 4'''
+    if isinstance(seq, str):
+        seq = seq.encode("ascii", "replace")
+    return seq.translate(_TABLE)
+
+
+def iter_kmers(seq, k: int, canonical: bool = False):
+    '''Generator of the integer codes of the k-mers of a sequence, by rolling update of the code of the previous k-mer
+
+    Parameters
+    ----------
+    seq : str or bytes
+        DNA or RNA sequence
+    k : int
+        Size of the k-mers (1 to 31)
+    canonical : bool, optional
+        If True, yields the smallest code between the k-mer and its inverse complement, by default False
+
+    Yields
+    ------
+    int
+        Code of each k-mer, in the order of the sequence
+    '''
+    if not 0 < k <= MAX_K:
+        raise ValueError(f"k must be between 1 and {MAX_K}")
+    mask = (1 << 2*k) - 1
+    shift = 2*(k - 1)
+    fwd = rev = 0
+    valid = 0
+    for b in _encode(seq):
+        if b == 4:                                          # Caracter que não é base: recomeçar o k-mer
+            valid = 0
+            continue
+        fwd = ((fwd << 2) | b) & mask
+        valid += 1
+        if canonical:
+            rev = (rev >> 2) | ((3 - b) << shift)
+            if valid >= k:
+                yield fwd if fwd < rev else rev
+        elif valid >= k:
+            yield fwd
+
+
+def kmer_counts(seq, k: int, canonical: bool = False, decode: bool = False, seq_type: str = "DNA") -> dict:
+    '''Counting of the k-mers of a sequence in a hash table
+
+    Parameters
+    ----------
+    seq : str or bytes
+        DNA or RNA sequence
+    k : int
+        Size of the k-mers (1 to 31)
+    canonical : bool, optional
+        If True, a k-mer and its inverse complement are counted together, by default False
+    decode : bool, optional
+        If True, the keys are the k-mer strings instead of the integer codes, by default False
+    seq_type : str, optional
+        Type of the sequence ('DNA' or 'RNA'), which sets the base of the code 3 of the decoded k-mers ("T" or "U"), by default 'DNA'
+
+    Returns
+    -------
+    dict
+        Dictionary with the k-mers and the number of occurrences
+    '''
+    counts = Counter(iter_kmers(seq, k, canonical))
+    if decode:
+        return {decode_kmer(c, k, seq_type): n for c, n in counts.items()}
+    return dict(counts)
+
+
+def decode_kmer(code: int, k: int, seq_type: str = "DNA") -> str:
+    '''Conversion of the integer code of a k-mer into its string
+
+    Parameters
+    ----------
+    code : int
+        Code of the k-mer
+    k : int
+        Size of the k-mer
+    seq_type : str, optional
+        Type of the sequence ('DNA' or 'RNA'): the code 3 is decoded as "T" or "U", by default 'DNA'
+
+    Returns
+    -------
+    str
+        DNA or RNA k-mer
+    '''
+    bases = "ACGU" if seq_type == "RNA" else "ACGT"
+    return "".join(bases[(code >> 2*(k - 1 - i)) & 3] for i in range(k))
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright 2022 by Group 7 (MSc Bioinformatics - University of Minho).  All rights reserved.
+
+"""
+This module provides the :class:`MappedSequence` class, a :class:`Sequence` backed by a file opened through `mmap`.
+The file can be a flat sequence file or a single record FASTA file, with the sequence wrapped in lines of the same length.
+The sequence is never copied into a Python string as a whole:
+    - view(): zero-copy memoryview of a window that lies in a single line of the file (always the case for flat files)
+    - get_slice(), percentage(), comp_inverse() and get_codons(): work on windows of the file, reading it in bounded chunks
+Several processes mapping the same file share the pages of the operating system cache. The object can be pickled, each process maps the file again.
+"""
+
+import mmap
+import re
+import WindowStats
+from Sequence import ALPHABETS, Sequence
+
+CHUNK_SIZE = 1 << 20
+_COMPLEMENT = bytes.maketrans(b"ACGTacgt", b"TGCATGCA")
+
+
+class MappedSequence(Sequence):
+    def __init__(self, path: str, check: str = None) -> None:
+        '''
+        Mapping of the file and validation of the sequence, in chunks, without loading the file in memory
+
+        Parameters
+        ------------
+        path: str
+            Path of the flat or FASTA file
+        check: str
+            Type of the sequence ('DNA', 'RNA' or 'AMINO') when already known (trusted input). The validation is skipped, by default None
+
+        Raises
+        ------------
+        ValueError
+            If the lines of the sequence do not have all the same length
+        TypeError
+            If the sequence is invalid
+        '''
+        self.path = path
+        self.id = None
+        self.qualities = None
+        self._seq = None
+        self._map()
+        if check is None:
+            self.check = self._classify()
+        elif check in ("DNA", "RNA", "AMINO"):
+            self.check = check
+        else:
+            raise TypeError(f"Invalid sequence type: {check}")
+
+    def _map(self):
+        '''Auxiliary method that maps the file and finds the layout of the sequence: first byte, bases per line and bytes per line'''
+        with open(self.path, "rb") as handle:
+            try:
+                self._mm = mmap.mmap(handle.fileno(), 0, access = mmap.ACCESS_READ)
+            except ValueError:                              # Ficheiro vazio
+                self._mm = b""
+        mm = self._mm
+        start = 0
+        if mm[:1] == b">":
+            start = mm.find(b"\n") + 1 or len(mm)
+            self.id = bytes(mm[1:start]).decode("ascii").split(maxsplit = 1)[0] if bytes(mm[1:start]).strip() else ""
+        end = len(mm)
+        while end > start and mm[end - 1:end] in (b"\n", b"\r", b" "):
+            end -= 1
+        nl = mm.find(b"\n", start, end)
+        if nl == -1:
+            width = stride = end - start
+        else:
+            width = nl - start - (mm[nl - 1:nl] == b"\r")
+            stride = nl - start + 1
+        self._start, self._end, self._width, self._stride = start, end, width, stride
+        if nl == -1:
+            self.length = width
+        else:
+            lines, rest = divmod(end - start, stride)
+            breaks = sum(mm[x:min(x + CHUNK_SIZE, end)].count(b"\n") for x in range(start, end, CHUNK_SIZE))
+            if rest > width or breaks != lines or mm[start + stride - 1:end:stride].count(b"\n") != lines:
+                raise ValueError("Only single record files with all the lines of the same length are supported")
+            self.length = lines*width + rest
+
+    def _offset(self, k: int) -> int:
+        '''Auxiliary method that converts the position of a base into the offset in the file'''
+        line, col = divmod(k, self._width)
+        return self._start + line*self._stride + col
+
+    def _chunks(self, i: int = 0, j: int = None, size: int = CHUNK_SIZE):
+        '''Auxiliary generator of the bases between i and j, in chunks of up to "size" bytes of the file (without the line breaks)'''
+        if j is None:
+            j = self.length
+        if j <= i:
+            return
+        a, b = self._offset(i), self._offset(j - 1) + 1
+        for x in range(a, b, size):
+            yield self._mm[x:min(x + size, b)].translate(None, b"\r\n")
+
+    def _classify(self) -> str:
+        '''Auxiliary method that determines the type of the sequence chunk by chunk, keeping the alphabets where all the chunks fit'''
+        candidates = list(ALPHABETS)
+        for chunk in self._chunks():
+            chunk = chunk.upper()
+            candidates = [(name, abc) for name, abc in candidates if not chunk.translate(None, abc)]
+            if not candidates:
+                raise TypeError("Invalid input string!")
+        return candidates[0][0]
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_mm"] = None
+        state["_seq"] = None
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._map()
+
+    def __len__(self) -> int:
+        '''
+        Number of characters of the sequence
+
+        Returns
+        ------------
+        int
+            Length of the sequence
+        '''
+        return self.length
+
+    def close(self):
+        '''
+        Unmapping of the file
+        '''
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+
+    def __enter__(self) -> "MappedSequence":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def seq(self) -> str:
+        '''
+        Complete sequence as a string. It is only built (and kept) when a method that needs the whole string is used
+
+        Returns
+        ------------
+        str
+            Complete sequence
+        '''
+        if self._seq is None:
+            self._seq = self.get_slice(0, self.length)
+        return self._seq
+
+    def _window(self, i: int, j: int) -> tuple:
+        '''Auxiliary method that normalizes the limits of a window like the slices of a string'''
+        i, j, _ = slice(i, j).indices(self.length)
+        return i, max(i, j)
+
+    def view(self, i: int, j: int) -> memoryview:
+        '''
+        Zero-copy view of the bytes of the window between i and j (as they are in the file, not capitalized)
+
+        Returns
+        ------------
+        memoryview
+            View of the window over the mapped file
+
+        Raises
+        ------------
+        ValueError
+            If the window crosses a line break of the file
+        '''
+        i, j = self._window(i, j)
+        if j > i and (i // self._width) != ((j - 1) // self._width):
+            raise ValueError("Window crosses a line break of the file, use get_slice")
+        a = self._offset(i) if j > i else 0
+        return memoryview(self._mm)[a:a + j - i]
+
+    def get_slice(self, i: int, j: int) -> str:
+        '''
+        Slice of the sequence between i and j, read only from the window of the file
+
+        Returns
+        ------------
+        str
+            String with the slice of the sequence
+        '''
+        i, j = self._window(i, j)
+        return b"".join(self._chunks(i, j)).upper().decode("ascii")
+
+    def percentage(self, i: int = None, j: int = None) -> dict:
+        '''
+        Construction of a dictionary with the elements of the sequence (or of the window between i and j) and corresponding percentage
+        The file is read in chunks
+
+        Returns
+        ------------
+        dict
+            Dictionary with the characters and percentage
+        '''
+        i, j = self._window(i, j)
+        abc = dict(ALPHABETS)[self.check]
+        count = dict.fromkeys(abc, 0)
+        for chunk in self._chunks(i, j):
+            chunk = chunk.upper()
+            for c in abc:
+                count[c] += chunk.count(c)
+        return {chr(c): round(v/(j - i), 3)*100 for c, v in count.items() if v}
+
+    def comp_inverse(self, i: int = None, j: int = None) -> str:
+        '''
+        Inversion and complementarity of the sequence (or of the window between i and j)
+        Only executes in case the object is a DNA sequence
+
+        Returns
+        ------------
+        str
+            String corresponding to the inverse and complement of the window
+        '''
+        assert self.check == "DNA", "Introduced sequence must be DNA!"
+        i, j = self._window(i, j)
+        if j == i:
+            raise Exception("Empty sequence!")
+        return b"".join(self._chunks(i, j)).translate(_COMPLEMENT)[::-1].upper().decode("ascii")
+
+    def get_codons(self, i: int = None, j: int = None) -> list:
+        '''
+        Obtaining of all the codons of the sequence (or of the window between i and j)
+        Only executes in case the object is a DNA sequence
+
+        Returns
+        ------------
+        list
+            List with all the codons of the window
+        '''
+        assert self.check == "DNA", "Introduced sequence must be DNA!"
+        i, j = self._window(i, j)
+        return re.findall("(...)", self.get_slice(i, j))
+
+    def window_stats(self, window: int, step: int = None, codons: bool = False):
+        '''
+        Composition statistics of sliding windows of the sequence (see Sequence.window_stats), reading the file in chunks
+
+        Yields
+        ------------
+        WindowStats.Window
+            Statistics of each complete window
+        '''
+        return WindowStats.sliding_windows(self._chunks(), window, step, codons)
@@ -13,6 +13,7 @@ This class includes diverse strategies for this, such as:
 """
 
 from Motifs import Motifs
+from Sequence import validate_many
 from random import randint
 from typing import Union
 
@@ -32,6 +33,7 @@ class MotifFinding:
             list of sequences, by default None
         '''
         self.motifSize = size
+        self._seqs_type = None
         if (seqs != None):
             self.seqs = seqs
             self.alphabet = self.alphabet()
@@ -100,12 +102,14 @@ class MotifFinding:
         str
             alphabet of all the sequences 
         '''
-        if all (i in 'ACGT' for i in self.seqs[0]) is True: #DNA
-            return 'ACGT'
-        elif all (i in 'ACGU' for i in self.seqs[0]) is True: #RNA
-            return 'ACGU'
-        elif all (i in 'FLIMVSPTAY_HQNKDECWRG' for i in self.seqs[0]) is True: #AMINO
-            return 'FLIMVSPTAY_HQNKDECWRG'
+        try:                                            # Validação única de todas as sequências: os motifs de sequências de DNA são sempre DNA
+            self._seqs_type = 'DNA' if set(validate_many(self.seqs)) == {'DNA'} else None
+        except TypeError:
+            self._seqs_type = None
+        letters = set(self.seqs[0])
+        for abc in ('ACGT', 'ACGU', 'FLIMVSPTAY_HQNKDECWRG'): #DNA, RNA, AMINO
+            if letters.issubset(abc):
+                return abc
     
     def createMotifFromIndexes(self, indexes: list, pseudocount: Union[int, float] = 0) -> Motifs:
         '''Creates an instance of the Motifs Class - which calculates the probabilistic PWM (Position Weighted Matrix) profile of a given list of sequences.
@@ -127,7 +131,7 @@ class MotifFinding:
         for i,ind in enumerate(indexes):
             sequence = self.seqs[i][ind:ind+self.motifSize]
             pseqs.append(sequence)
-        return Motifs(pseqs, pseudo = pseudocount)
+        return Motifs(pseqs, pseudo = pseudocount, abc = self._seqs_type)
 
     # SCORES
         
@@ -10,7 +10,7 @@ This class includes diverse methods that allows exploring these, such as:
     - consensus(): returns the consensus between two different sequences using the profile created.
 """
 
-from Sequence import Sequence
+from Sequence import classify, validate_many
 import math
 
 
@@ -25,10 +25,13 @@ class Motifs():
         
         kwargs: dictionary
             May take as keys:
-                profile -- pseudo
+                profile -- pseudo -- abc (type of the sequences when already validated: 'DNA', 'RNA' or 'AMINO')
         '''
         self.list_seq = list_seq
-        self.abc = self.validate_abc()
+        if kwargs.get('abc') in ('DNA', 'RNA', 'AMINO'):
+            self.abc = kwargs['abc']
+        else:
+            self.abc = self.validate_abc()
         self.profile_type = 'pwm'
         self.pseudo = 0
         self.n = 4
@@ -63,8 +66,7 @@ class Motifs():
         str
             Type of the sequence ('DNA', 'RNA' or 'AMINO')
         '''
-        test = Sequence(seq)
-        return test.check
+        return classify(seq)
         
     
     def validate_abc(self) -> str:
@@ -81,10 +83,9 @@ class Motifs():
         TypeError
             None of the sequences are of the same type
         '''
-        class_abc = Sequence(self.list_seq[0])
-        abc = class_abc.check
-        for i in self.list_seq[1:]:           
-            valid = self.validate_seq(i)
+        types = validate_many(self.list_seq)
+        abc = types[0]
+        for valid in types[1:]:
             if valid != abc:
                 raise TypeError("Sequences introduced are not of the same type!") 
         return abc
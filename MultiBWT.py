@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright 2022 by Group 7 (MSc Bioinformatics - University of Minho).  All rights reserved.
+
+"""
+This module provides the :class:`MultiBWT` class, a generalized :class:`BWT` index of many sequences (e.g. the contigs or genomes of a FASTA file).
+The sequences are joined with a separator ("#") and end in "$", so a single index (and index file) replaces one BWT per sequence:
+	- The separators can not be part of a pattern, so no occurrence spans the boundary of two sequences
+	- The positions are reported as (sequence_id, offset), found by binary search in the start of each sequence
+	- The repeat queries (lcp, longest_repeat, maximal_repeats and distinct_substrings) stop at the separators, so no repeat spans two sequences either
+"""
+
+from array import array
+from bisect import bisect_right
+from BWT import BWT, SA_SAMPLE
+from Sequence import Sequence
+
+SEPARATOR = "#"
+
+
+class MultiBWT(BWT):
+	def __init__(self, seqs, sa_sample: int = SA_SAMPLE, rank: str = "occ"):
+		'''Construction of the index of all the sequences
+
+		Parameters
+		----------
+		seqs : iterable
+			Sequences (identified by their order), Sequence objects (identified by their id, e.g. from SeqReader) or tuples (sequence_id, sequence)
+		sa_sample : int, optional
+			Sampling rate of the suffix array (see BWT), by default 32
+		rank : str, optional
+			Rank structure of the BWT line (see BWT), by default "occ"
+
+		Raises
+		------
+		ValueError
+			If there are no sequences, or a sequence has the separator or "$"
+		'''
+		self.ids = []
+		self.starts = array("q")
+		parts = []
+		start = 0
+		for i, s in enumerate(seqs):
+			if isinstance(s, Sequence):
+				seq_id, s = (s.id if s.id is not None else i), s.seq
+			elif isinstance(s, str):
+				seq_id = i
+			else:
+				seq_id, s = s
+			if SEPARATOR in s or "$" in s:
+				raise ValueError(f"Sequence {seq_id} has \"{SEPARATOR}\" or \"$\"")
+			self.ids.append(seq_id)
+			self.starts.append(start)
+			parts.append(s)
+			start += len(s) + 1
+		if not parts:
+			raise ValueError("No sequences to index")
+		super().__init__(SEPARATOR.join(parts), sa_sample, rank)
+		self._set_query_codes()
+
+	def _set_query_codes(self):
+		'''Auxiliary method that removes the separator and "$" from the characters of the patterns'''
+		self._query_codes = {c: i for c, i in self._codes.items() if c not in (SEPARATOR, "$")}
+
+	def _position(self, p: int) -> tuple:
+		'''Auxiliary method that converts a position of the joined sequences into the sequence and the offset in it'''
+		i = bisect_right(self.starts, p) - 1
+		return self.ids[i], p - self.starts[i]
+
+	def _bounds(self, p: int) -> tuple:
+		'''Auxiliary method with the limits [start, end) in the joined sequences of the sequence that holds the position p'''
+		i = bisect_right(self.starts, p) - 1
+		return self.starts[i], (self.starts[i + 1] - 1 if i + 1 < len(self.starts) else self.n - 1)
+
+	def _room(self) -> array:
+		'''Auxiliary method with the number of characters from each position of the joined sequences to the end of its sequence (0 in the separators and "$")'''
+		room = array("q", bytes(8*self.n))
+		ends = list(self.starts[1:]) + [self.n]
+		for start, end in zip(self.starts, ends):
+			room[start:end] = array("q", range(end - 1 - start, -1, -1))
+		return room
+
+	def _lcp_data(self) -> tuple:
+		'''Auxiliary method with the indexed text, the suffix array and the LCP array (see BWT), with each LCP value cut at the end of the sequence of the suffix'''
+		if self._lcp is None:
+			text, sa, lcp = super()._lcp_data()
+			room = self._room()
+			for i, p in enumerate(sa):
+				if lcp[i] > room[p]:
+					lcp[i] = room[p]
+		return self._lcp
+
+	def _left_maximal(self, chars: bytes) -> bool:
+		'''Auxiliary method that also takes as left maximal the repeats at the start of sequences (preceded by the separator or "$")'''
+		return len(set(chars)) > 1 or self.alphabet[chars[0]] in (SEPARATOR, "$")
+
+	def distinct_substrings(self) -> int:
+		'''Method that counts the distinct (non empty) substrings of the sequences, without the ones that span the separators
+
+		Returns
+		-------
+		int
+			Number of distinct substrings
+		'''
+		text, sa, lcp = self._lcp_data()
+		room = self._room()
+		return sum(room[p] for p in sa) - sum(lcp)
+
+	def sequence(self, i: int) -> str:
+		'''Method that retrieves the sequence with index i (in the order of the index)
+
+		Parameters
+		----------
+		i : int
+			Index of the sequence
+
+		Returns
+		-------
+		str
+			Sequence i
+		'''
+		end = self.starts[i + 1] - 1 if i + 1 < len(self.starts) else self.n - 1
+		return self.seq[self.starts[i]:end]
+
+	def _file_parts(self) -> tuple:
+		'''Auxiliary method with the identifiers and the start of the sequences, written in the index file'''
+		return {"ids": self.ids}, [("seq_starts", "q", [self.starts])]
+
+	def _load_parts(self, header: dict, views: dict):
+		'''Auxiliary method that reads the identifiers and the start of the sequences of a mapped index file'''
+		if "ids" not in header:
+			raise ValueError("The index file has a single sequence, use BWT.load")
+		self.ids = header["ids"]
+		self.starts = views["seq_starts"]
+		self._set_query_codes()
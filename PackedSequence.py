@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright 2022 by Group 7 (MSc Bioinformatics - University of Minho).  All rights reserved.
+
+"""
+This module provides the :class:`PackedSequence` class, a compact representation of DNA sequences that stores 2 bits per base (4 bases per byte).
+The bases are coded as A=0, C=1, G=2, T=3, with the first base of each byte in its most significant bits.
+The class works directly on the packed bytes for:
+    - comp_inverse(): complementing is a bitwise NOT of the codes and reversing is done through a 256 entries byte table
+    - Slicing, base counting and percentage
+    - Codon extraction as integer codes (16*b1 + 4*b2 + b3) that feed the precompiled genetic codes: every 3 bytes (12 bases) hold 4 codons
+"""
+
+from collections import Counter
+from GeneticCode import BASES, get_code
+from Sequence import Sequence
+
+_PACK = {}
+_UNPACK = []
+for _b in range(256):
+    _quad = "".join(BASES[(_b >> s) & 3] for s in (6, 4, 2, 0))
+    _PACK[_quad] = _b
+    _UNPACK.append(_quad)
+for _n in (1, 2, 3):                                        # Último byte incompleto (completado com "A", código 0)
+    for _b in range(0, 256, 1 << (8 - 2*_n)):
+        _PACK[_UNPACK[_b][:_n]] = _b
+_UNPACK_RNA = [q.replace("T", "U") for q in _UNPACK]
+_CODONS = ["".join(BASES[(_c >> s) & 3] for s in (4, 2, 0)) for _c in range(64)]
+_BASE_COUNTS = [tuple(q.count(c) for c in BASES) for q in _UNPACK]
+_REV_COMP = bytes(sum(((~_b >> s) & 3) << (6 - s) for s in (6, 4, 2, 0)) for _b in range(256))
+
+
+class PackedSequence:
+    def __init__(self, seq) -> None:
+        '''
+        Packing of a DNA sequence in 2 bits per base. Only the bases "ACGT" can be represented (no gaps)
+
+        Parameters
+        ------------
+        seq: str or Sequence
+            DNA sequence to pack
+
+        Raises
+        ------------
+        TypeError
+            If the sequence has characters other than "ACGT"
+        '''
+        if isinstance(seq, Sequence):
+            seq = seq.seq
+        seq = seq.upper()
+        if seq.strip(BASES):
+            raise TypeError("Invalid input string! PackedSequence only accepts the bases ACGT")
+        self.check = "DNA"
+        self.length = len(seq)
+        self.data = bytearray(map(_PACK.__getitem__, (seq[i:i+4] for i in range(0, len(seq), 4))))
+
+    @classmethod
+    def _from_packed(cls, data: bytearray, length: int) -> "PackedSequence":
+        '''Auxiliary constructor from already packed bytes (without copying or validating them)'''
+        new = cls.__new__(cls)
+        new.check = "DNA"
+        new.length = length
+        new.data = data
+        return new
+
+    def __len__(self) -> int:
+        '''
+        Number of bases of the sequence
+
+        Returns
+        ------------
+        int
+            Length of the sequence
+        '''
+        return self.length
+
+    def __str__(self) -> str:
+        '''
+        Writing the string with the sequence and its type
+
+        Returns
+        ------------
+        str
+            String with the information of the object
+        '''
+        return self.check + ":" + self.unpack()
+
+    def __eq__(self, other) -> bool:
+        '''
+        Comparison of two packed sequences through their packed bytes
+
+        Returns
+        ------------
+        bool
+            True if both sequences have the same bases
+        '''
+        if not isinstance(other, PackedSequence):
+            return NotImplemented
+        return self.length == other.length and self.data == other.data
+
+    def __getitem__(self, key):
+        '''
+        Base at a position or packed slice of the sequence (only contiguous slices)
+
+        Returns
+        ------------
+        str or PackedSequence
+            Base at the position or the slice, still packed
+        '''
+        if isinstance(key, slice):
+            i, j, step = key.indices(self.length)
+            if step != 1:
+                raise ValueError("PackedSequence only supports contiguous slices")
+            return self._slice(i, max(i, j))
+        if key < 0:
+            key += self.length
+        if not 0 <= key < self.length:
+            raise IndexError("PackedSequence index out of range")
+        return BASES[(self.data[key >> 2] >> (6 - 2*(key & 3))) & 3]
+
+    def _slice(self, i: int, j: int) -> "PackedSequence":
+        '''Auxiliary method that shifts the bytes covering [i, j) so that the slice starts at the beginning of a byte'''
+        m = j - i
+        if m == 0:
+            return PackedSequence._from_packed(bytearray(), 0)
+        first, last = i >> 2, (j - 1) >> 2
+        if i & 3 == 0:
+            data = self.data[first:last + 1]
+        else:
+            chunk = self.data[first:last + 1]
+            val = int.from_bytes(chunk, "big") >> 2*(4*len(chunk) - (j - 4*first))
+            val = (val & ((1 << 2*m) - 1)) << 2*(-m % 4)
+            data = bytearray(val.to_bytes((m + 3) // 4, "big"))
+        if m & 3:                                           # Limpar as bases que sobram no último byte
+            data[-1] &= (0xFF << 2*(4 - (m & 3))) & 0xFF
+        return PackedSequence._from_packed(data, m)
+
+    def unpack(self) -> str:
+        '''
+        Unpacking of the sequence into a string
+
+        Returns
+        ------------
+        str
+            DNA sequence
+        '''
+        return "".join(map(_UNPACK.__getitem__, self.data))[:self.length]
+
+    def to_sequence(self) -> Sequence:
+        '''
+        Unpacking of the sequence into a Sequence object
+
+        Returns
+        ------------
+        Sequence
+            DNA sequence
+        '''
+        return Sequence(self.unpack())
+
+    def get_slice(self, i: int, j: int) -> str:
+        '''
+        Slice of the sequence between i and j, unpacking only the bytes that cover it
+
+        Returns
+        ------------
+        str
+            String with the slice of the sequence
+        '''
+        return self[i:j].unpack()
+
+    def counts(self) -> dict:
+        '''
+        Counting of each base directly over the packed bytes
+
+        Returns
+        ------------
+        dict
+            Dictionary with the bases and the number of occurrences
+        '''
+        res = [0, 0, 0, 0]
+        for b, n in Counter(self.data).items():
+            for k, c in enumerate(_BASE_COUNTS[b]):
+                res[k] += c*n
+        res[0] -= -self.length % 4                          # Bases "A" usadas para completar o último byte
+        return dict(zip(BASES, res))
+
+    def percentage(self) -> dict:
+        '''
+        Construction of a dictionary with the bases of the sequence and corresponding percentage
+
+        Returns
+        ------------
+        dict
+            Dictionary with the bases and percentage
+        '''
+        return {c: round(v/self.length, 3)*100 for c, v in self.counts().items() if v}
+
+    def transcription(self) -> str:
+        '''
+        Unpacking of the sequence with the thymine base 'T' replaced by the uracil base 'U'
+
+        Returns
+        ------------
+        str
+            RNA sequence
+        '''
+        if not self.length:
+            raise Exception("Empty sequence!")
+        return "".join(map(_UNPACK_RNA.__getitem__, self.data))[:self.length]
+
+    def comp_inverse(self) -> "PackedSequence":
+        '''
+        Inversion and complementarity of the sequence, done over the packed bytes
+
+        Returns
+        ------------
+        PackedSequence
+            Packed inverse and complement of the sequence
+        '''
+        if not self.length:
+            raise Exception("Empty sequence!")
+        data = self.data.translate(_REV_COMP)[::-1]
+        pad = -self.length % 4
+        if pad:                                             # As bases de enchimento passaram para o início
+            val = (int.from_bytes(data, "big") << 2*pad) & ((1 << 8*len(data)) - 1)
+            data = bytearray(val.to_bytes(len(data), "big"))
+        return PackedSequence._from_packed(data, self.length)
+
+    def codon_codes(self, frame: int = 0) -> list:
+        '''
+        Obtaining of the integer codes (16*b1 + 4*b2 + b3) of the codons of a reading frame, read from the packed bytes:
+        each group of 3 bytes (after shifting the frame to the start of a byte) has 4 codons of 6 bits
+
+        Parameters
+        ----------
+        frame: int
+            Offset of the first codon (0, 1 or 2), by default 0
+
+        Returns
+        ------------
+        list
+            List with the integer codes of the codons
+        '''
+        data = self.data if frame == 0 else self[frame:].data
+        n = max(0, (self.length - frame) // 3)
+        data = bytes(data) + bytes(-len(data) % 3)         # Grupos de 3 bytes completos
+        codes = []
+        for g in range(0, len(data), 3):
+            v = int.from_bytes(data[g:g+3], "big")
+            codes += (v >> 18, (v >> 12) & 63, (v >> 6) & 63, v & 63)
+        del codes[n:]
+        return codes
+
+    def get_codons(self, frame: int = 0) -> list:
+        '''
+        Obtaining of all the codons of a reading frame, built from their integer codes (only the codons of the frame are unpacked)
+
+        Parameters
+        ----------
+        frame: int
+            Offset of the first codon (0, 1 or 2), by default 0
+
+        Returns
+        ------------
+        list
+            List with all the codons of the sequence
+        '''
+        return list(map(_CODONS.__getitem__, self.codon_codes(frame)))
+
+    def translation(self, table: int = 1) -> str:
+        '''
+        Translation of the codons of the first reading frame through their integer codes
+
+        Parameters
+        ----------
+        table: int
+            NCBI identifier of the genetic code, by default 1 (Standard)
+
+        Returns
+        ------------
+        str
+            Amino acid chain
+        '''
+        if not self.length:
+            raise Exception("Empty sequence!")
+        return get_code(table).translate_codes(self.codon_codes())
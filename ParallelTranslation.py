@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright 2022 by Group 7 (MSc Bioinformatics - University of Minho).  All rights reserved.
+
+"""
+This module provides the parallel translation of long DNA sequences, used by :class:`Sequence` when a number of processes is given.
+The sequence is split into chunks with a multiple of 3 bases, so every chunk starts at a codon of the first reading frame:
+    - translate(): each chunk is translated in a process pool and the amino acid chains are joined
+    - all_prots(): each chunk is translated and scanned in the pool. The proteins that cross the border of the chunks are stitched afterwards,
+      so the result is identical to the serial Sequence.get_all_prots
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from GeneticCode import get_code
+
+MIN_CHUNK = 3 << 15
+
+
+def _chunks(seq: str, processes: int, chunk_size: int = None) -> list:
+    '''Auxiliary function that splits the sequence into chunks aligned to the codons (multiple of 3 bases)'''
+    if chunk_size is None:
+        chunk_size = max(MIN_CHUNK, -(-len(seq) // (4*processes)))
+    chunk_size = max(3, chunk_size - chunk_size % 3)
+    return [seq[i:i + chunk_size] for i in range(0, len(seq), chunk_size)]
+
+
+def _translate_chunk(args: tuple) -> str:
+    '''Auxiliary function (run in the workers) that translates a chunk'''
+    chunk, table = args
+    return get_code(table).translate(chunk)
+
+
+def _scan_chunk(args: tuple) -> tuple:
+    '''Auxiliary function (run in the workers) that translates a chunk and finds its proteins. Returns:
+        - head: amino acids until the first stop (included), or the whole chunk if it has no stop
+        - middle: the complete proteins after the first stop
+        - tail: the protein still open at the end of the chunk (None if there is none)
+        - has_stop: if the chunk has a stop
+    '''
+    from Sequence import _protein_spans
+    aa = _translate_chunk(args)
+    stop = aa.find("_")
+    if stop == -1:
+        return aa, [], None, False
+    rest = aa[stop + 1:]
+    middle = [rest[i:j] for i, j in _protein_spans(rest)]
+    start = rest.find("M", rest.rfind("_") + 1)
+    return aa[:stop + 1], middle, (rest[start:] if start != -1 else None), True
+
+
+def translate(seq: str, table: int = 1, processes: int = None, chunk_size: int = None) -> str:
+    '''Translation of the first reading frame of a DNA sequence in a process pool
+
+    Parameters
+    ----------
+    seq : str
+        Uppercase DNA sequence
+    table : int, optional
+        NCBI identifier of the genetic code, by default 1 (Standard)
+    processes : int, optional
+        Number of worker processes, by default the number of CPUs
+    chunk_size : int, optional
+        Number of bases of each chunk (rounded down to a multiple of 3), by default chosen from the length and the number of processes
+
+    Returns
+    -------
+    str
+        Amino acid chain, identical to the serial translation
+    '''
+    processes = processes or os.cpu_count()
+    chunks = _chunks(seq, processes, chunk_size)
+    with ProcessPoolExecutor(processes) as pool:
+        return "".join(pool.map(_translate_chunk, [(c, table) for c in chunks]))
+
+
+def all_prots(seq: str, table: int = 1, processes: int = None, chunk_size: int = None) -> list:
+    '''Proteins of the first reading frame of a DNA sequence, translated and scanned in a process pool
+
+    Parameters
+    ----------
+    seq : str
+        Uppercase DNA sequence
+    table : int, optional
+        NCBI identifier of the genetic code, by default 1 (Standard)
+    processes : int, optional
+        Number of worker processes, by default the number of CPUs
+    chunk_size : int, optional
+        Number of bases of each chunk (rounded down to a multiple of 3), by default chosen from the length and the number of processes
+
+    Returns
+    -------
+    list
+        Proteins, in the same order as the serial Sequence.get_all_prots
+    '''
+    processes = processes or os.cpu_count()
+    chunks = _chunks(seq, processes, chunk_size)
+    with ProcessPoolExecutor(processes) as pool:
+        results = pool.map(_scan_chunk, [(c, table) for c in chunks])
+        prots = []
+        carry = None                                        # Proteína aberta no fim do chunk anterior
+        for head, middle, tail, has_stop in results:
+            if carry is not None:
+                if not has_stop:
+                    carry += head
+                    continue
+                prots.append(carry + head)
+            else:
+                start = head.find("M")
+                if not has_stop:
+                    carry = head[start:] if start != -1 else None
+                    continue
+                if start != -1:
+                    prots.append(head[start:])
+            prots.extend(middle)
+            carry = tail
+        return prots
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright 2022 by Group 7 (MSc Bioinformatics - University of Minho).  All rights reserved.
+
+"""
+This module provides the rank structures over the BWT line used by the :class:`BWT` index (chosen with the "rank" argument).
+All of them answer rank(c, i), the number of occurrences of the code c in the first i rows, and access to the code of a row:
+	- :class:`OccRank` ("occ"): the BWT line and the counts of every code at checkpoints every 128 rows. With at most 4 symbols besides "$" (DNA)
+	  the line is packed in 2 bits per row (4 rows per byte) and the row of "$" is kept apart, otherwise it has one code per byte
+	- :class:`RunLengthRank` ("runlength"): the runs of the BWT line (code and start of each run), with the cumulative length of the runs of each code.
+	  The memory depends on the number of runs instead of the length, for very repetitive sequences (e.g. many strains of the same species)
+	- :class:`WaveletRank` ("wavelet"): a wavelet matrix, with one bitvector per bit of the codes. The rank takes O(log σ) bitvector ranks and
+	  the memory is about log σ bits per row, independent of the size of the alphabet (e.g. the 21 amino acids of the proteins)
+Each structure can be written in the sections of an index file and rebuilt from the views of the mapped file (see BWT.save and BWT.load).
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+
+OCC_STEP = 128
+
+# Códigos 1 a 4 em 2 bits (o "$", código 0, fica como o código 1): tabela da posição k de cada byte
+_PACK = [bytes(((max(c, 1) - 1) & 3) << (6 - 2*k) for c in range(256)) for k in range(4)]
+_UNPACK = [bytes(((b >> (6 - 2*k)) & 3) + 1 for b in range(256)) for k in range(4)]
+# Bits (da posição 0 no bit 3 à posição 3 no bit 0) das posições de cada byte iguais a v, contados com int.bit_count
+_MATCHES = [bytes(sum((((b >> (6 - 2*t)) & 3) == v) << (3 - t) for t in range(4)) for b in range(256)) for v in range(4)]
+
+
+def _pack(codes: bytes) -> bytes:
+	'''Auxiliary function that packs a BWT line of codes 0 to 4 in 2 bits per row, from the most significant bits of each byte (code 0 is packed as code 1)'''
+	codes = bytes(codes) + bytes(-len(codes) % 4)
+	val = 0
+	for k in range(4):
+		val |= int.from_bytes(codes[k::4].translate(_PACK[k]), "big")
+	return val.to_bytes(len(codes) // 4, "big")
+
+
+class OccRank:
+	name = "occ"
+
+	def __init__(self, bwt: bytes, sigma: int, step: int = OCC_STEP):
+		'''Construction of the Occ checkpoints of the BWT line. The line is packed in 2 bits per row when it has at most 4 codes besides a single "$" (code 0)
+
+		Parameters
+		----------
+		bwt : bytes
+			Codes of the BWT line
+		sigma : int
+			Number of codes of the alphabet
+		step : int, optional
+			Number of rows between checkpoints (a multiple of 4 to pack the line), by default 128
+		'''
+		self.sigma = sigma
+		self.step = step
+		self.n = len(bwt)
+		self.occ = []
+		for c in range(sigma):
+			acc, occ = 0, array("q", [0])
+			for b in range(0, len(bwt), step):
+				acc += bwt.count(c, b, b + step)
+				occ.append(acc)
+			self.occ.append(occ)
+		self.packed = sigma <= 5 and step % 4 == 0 and bwt.count(0) <= 1
+		if self.packed:
+			self.dollar = bwt.find(0) % (self.n + 1)									# Linha do "$" (n se não existir)
+			self.bwt = _pack(bwt)
+		else:
+			self.bwt = bwt
+
+	def __len__(self) -> int:
+		return self.n
+
+	def __getitem__(self, r: int) -> int:
+		if not self.packed:
+			return self.bwt[r]
+		if r < 0:
+			r += self.n
+		if r == self.dollar:
+			return 0
+		return ((self.bwt[r >> 2] >> (6 - 2*(r & 3))) & 3) + 1
+
+	def rank(self, c: int, i: int) -> int:
+		'''Number of occurrences of the code c in the first i rows, from the nearest checkpoint. In the packed line the rows of c after the checkpoint
+		are the bits of a translation of their bytes, without the bits of the rows from i in the last byte'''
+		step = self.step
+		if not self.packed:
+			return self.occ[c][i // step] + self.bwt[i - i % step:i].count(c)
+		if c == 0:
+			return int(self.dollar < i)
+		b = i - i % step
+		res = self.occ[c][i // step] + (int.from_bytes(self.bwt[b >> 2:(i + 3) >> 2].translate(_MATCHES[c - 1]), "big") >> (-i & 3)).bit_count()
+		if c == 1 and b <= self.dollar < i:											# O "$" está guardado como o código 1
+			res -= 1
+		return res
+
+	def tobytes(self) -> bytes:
+		'''Codes of the whole BWT line'''
+		if not self.packed:
+			return bytes(self.bwt)
+		data = bytes(self.bwt)
+		res = bytearray(4*len(data))
+		for k in range(4):
+			res[k::4] = data.translate(_UNPACK[k])
+		del res[self.n:]
+		if self.dollar < self.n:
+			res[self.dollar] = 0
+		return bytes(res)
+
+	@property
+	def nbytes(self) -> int:
+		'''Memory used by the structure'''
+		return len(self.bwt) + sum(8*len(o) for o in self.occ)
+
+	def _sections(self) -> tuple:
+		'''Auxiliary method with the parameters and the sections (name, typecode, buffers) written in an index file'''
+		params = {"sigma": self.sigma, "step": self.step, "n": self.n, "packed": self.packed}
+		if self.packed:
+			params["dollar"] = self.dollar
+		return params, [("bwt", "B", [self.bwt]), ("occ", "q", self.occ)]
+
+	@classmethod
+	def _from_sections(cls, params: dict, views: dict) -> "OccRank":
+		'''Auxiliary constructor from the views of the sections of a mapped index file'''
+		new = cls.__new__(cls)
+		new.sigma, new.step = params["sigma"], params["step"]
+		new.packed = params.get("packed", False)										# Ficheiros com um código por byte
+		new.bwt = views["bwt"]
+		new.n = params.get("n", len(new.bwt))
+		if new.packed:
+			new.dollar = params["dollar"]
+		blocks = len(views["occ"]) // new.sigma
+		new.occ = [views["occ"][c*blocks:(c + 1)*blocks] for c in range(new.sigma)]
+		return new
+
+
+class RunLengthRank:
+	name = "runlength"
+
+	def __init__(self, bwt: bytes, sigma: int):
+		'''Construction of the runs of the BWT line
+
+		Parameters
+		----------
+		bwt : bytes
+			Codes of the BWT line
+		sigma : int
+			Number of codes of the alphabet
+		'''
+		self.sigma = sigma
+		self.n = len(bwt)
+		heads = bytearray()
+		self.starts = array("q")
+		self.runs = [array("q") for _ in range(sigma)]						# Índices das corridas de cada código
+		self.cum = [array("q", [0]) for _ in range(sigma)]					# Comprimento acumulado das corridas de cada código
+		prev = -1
+		for r, c in enumerate(bwt):
+			if c != prev:
+				if prev != -1:
+					self.cum[prev].append(self.cum[prev][-1] + r - self.starts[-1])
+				self.runs[c].append(len(heads))
+				heads.append(c)
+				self.starts.append(r)
+				prev = c
+		if prev != -1:
+			self.cum[prev].append(self.cum[prev][-1] + self.n - self.starts[-1])
+		self.heads = bytes(heads)
+
+	def __len__(self) -> int:
+		return self.n
+
+	def _run(self, r: int) -> int:
+		'''Auxiliary method with the index of the run of row r'''
+		return bisect_right(self.starts, r) - 1
+
+	def __getitem__(self, r: int) -> int:
+		if r < 0:
+			r += self.n
+		return self.heads[self._run(r)]
+
+	def rank(self, c: int, i: int) -> int:
+		'''Number of occurrences of the code c in the first i rows: the length of the previous runs of c and the part of the current run'''
+		if i <= 0:
+			return 0
+		j = self._run(i - 1)
+		runs = self.runs[c]
+		t = bisect_left(runs, j)
+		res = self.cum[c][t]
+		if t < len(runs) and runs[t] == j:
+			res += i - self.starts[j]
+		return res
+
+	def select(self, c: int, k: int) -> int:
+		'''Row of the occurrence k (from 0) of the code c
+
+		Raises
+		------
+		IndexError
+			If the code has fewer than k + 1 occurrences
+		'''
+		cum = self.cum[c]
+		if not 0 <= k < cum[-1]:
+			raise IndexError("Occurrence out of range")
+		t = bisect_right(cum, k) - 1
+		return self.starts[self.runs[c][t]] + k - cum[t]
+
+	def tobytes(self) -> bytes:
+		'''Codes of the whole BWT line, expanded from the runs'''
+		ends = list(self.starts[1:]) + [self.n]
+		return b"".join(bytes([c])*(e - s) for c, s, e in zip(bytes(self.heads), self.starts, ends))
+
+	@property
+	def nbytes(self) -> int:
+		'''Memory used by the structure'''
+		return len(self.heads) + 8*len(self.starts) + sum(8*(len(a) + len(b)) for a, b in zip(self.runs, self.cum))
+
+	def _sections(self) -> tuple:
+		'''Auxiliary method with the parameters and the sections (name, typecode, buffers) written in an index file'''
+		params = {"sigma": self.sigma, "n": self.n, "runs": [len(a) for a in self.runs]}
+		return params, [("heads", "B", [self.heads]), ("starts", "q", [self.starts]), ("runs", "q", self.runs), ("cum", "q", self.cum)]
+
+	@classmethod
+	def _from_sections(cls, params: dict, views: dict) -> "RunLengthRank":
+		'''Auxiliary constructor from the views of the sections of a mapped index file'''
+		new = cls.__new__(cls)
+		new.sigma, new.n = params["sigma"], params["n"]
+		new.heads, new.starts = views["heads"], views["starts"]
+		new.runs, new.cum = [], []
+		a = b = 0
+		for size in params["runs"]:
+			new.runs.append(views["runs"][a:a + size])
+			new.cum.append(views["cum"][b:b + size + 1])
+			a, b = a + size, b + size + 1
+		return new
+
+
+class WaveletRank:
+	name = "wavelet"
+
+	def __init__(self, bwt: bytes, sigma: int):
+		'''Construction of the wavelet matrix of the BWT line: in each level, the bitvector of one bit of the codes (from the most significant),
+		after which the rows are stably reordered with the zeros first
+
+		Parameters
+		----------
+		bwt : bytes
+			Codes of the BWT line
+		sigma : int
+			Number of codes of the alphabet
+		'''
+		self.sigma = sigma
+		self.n = len(bwt)
+		self.levels = max(1, (sigma - 1).bit_length())
+		self.stride = (self.n + 7) // 8												# Bytes de cada nível
+		self.zeros = []
+		bits = []
+		seq = bytes(bwt)
+		for l in range(self.levels):
+			shift = self.levels - 1 - l
+			digits = seq.translate(bytes(48 + (c >> shift & 1) for c in range(256)))		# "0" ou "1" por linha
+			bits.append(int(digits.decode("ascii") + "0"*(8*self.stride - self.n) or "0", 2).to_bytes(self.stride, "big"))
+			self.zeros.append(digits.count(b"0"))
+			seq = bytes(c for c in seq if not c >> shift & 1) + bytes(c for c in seq if c >> shift & 1)
+		self.bits = b"".join(bits)
+		self.counts = array("q")													# Nº de uns antes de cada bloco de 64 bytes (por nível)
+		for l in range(self.levels):
+			acc = 0
+			for b in range(l*self.stride, (l + 1)*self.stride + 1, 64):
+				self.counts.append(acc)
+				acc += int.from_bytes(self.bits[b:min(b + 64, (l + 1)*self.stride)], "big").bit_count()
+		self._blocks = len(self.counts) // self.levels
+
+	def _rank1(self, l: int, i: int) -> int:
+		'''Auxiliary method with the number of ones in the first i bits of level l'''
+		bits = self.bits
+		blk = i >> 9
+		a = l*self.stride
+		b = a + (i >> 3)
+		res = self.counts[l*self._blocks + blk] + int.from_bytes(bits[a + (blk << 6):b], "big").bit_count()
+		r = i & 7
+		if r:
+			res += (bits[b] >> (8 - r)).bit_count()
+		return res
+
+	def __len__(self) -> int:
+		return self.n
+
+	def __getitem__(self, r: int) -> int:
+		if r < 0:
+			r += self.n
+		c = 0
+		for l in range(self.levels):
+			a = l*self.stride
+			bit = self.bits[a + (r >> 3)] >> (7 - (r & 7)) & 1
+			c = c << 1 | bit
+			ones = self._rank1(l, r)
+			r = self.zeros[l] + ones if bit else r - ones
+		return c
+
+	def rank(self, c: int, i: int) -> int:
+		'''Number of occurrences of the code c in the first i rows: the interval [0, i) follows the bits of c down the levels'''
+		p, q = 0, i
+		for l in range(self.levels):
+			if c >> (self.levels - 1 - l) & 1:
+				p, q = self.zeros[l] + self._rank1(l, p), self.zeros[l] + self._rank1(l, q)
+			else:
+				p, q = p - self._rank1(l, p), q - self._rank1(l, q)
+		return q - p
+
+	def tobytes(self) -> bytes:
+		'''Codes of the whole BWT line, read from the levels'''
+		return bytes(self[r] for r in range(self.n))
+
+	@property
+	def nbytes(self) -> int:
+		'''Memory used by the structure'''
+		return len(self.bits) + 8*len(self.counts)
+
+	def _sections(self) -> tuple:
+		'''Auxiliary method with the parameters and the sections (name, typecode, buffers) written in an index file'''
+		params = {"sigma": self.sigma, "n": self.n, "zeros": self.zeros}
+		return params, [("bits", "B", [self.bits]), ("counts", "q", [self.counts])]
+
+	@classmethod
+	def _from_sections(cls, params: dict, views: dict) -> "WaveletRank":
+		'''Auxiliary constructor from the views of the sections of a mapped index file'''
+		new = cls.__new__(cls)
+		new.sigma, new.n, new.zeros = params["sigma"], params["n"], params["zeros"]
+		new.levels = max(1, (new.sigma - 1).bit_length())
+		new.stride = (new.n + 7) // 8
+		new.bits, new.counts = views["bits"], views["counts"]
+		new._blocks = len(new.counts) // new.levels
+		return new
+
+
+RANKS = {cls.name: cls for cls in (OccRank, RunLengthRank, WaveletRank)}
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright 2022 by Group 7 (MSc Bioinformatics - University of Minho).  All rights reserved.
+
+"""
+This module provides the :class:`ReadAligner` class, a seed-and-extend read aligner built on the :class:`BWT` index (or :class:`MultiBWT`):
+	- Seeding: the super-maximal exact matches of the read (see BWT.smems) with up to max_occ occurrences. Each occurrence gives a diagonal of the reference
+	- Candidates: the diagonals closer than the band are grouped and the groups covered by the longest seeds are extended
+	- Extension: banded dynamic programming around the diagonal of each candidate, local (Smith-Waterman) or global on the read
+	  (Needleman-Wunsch with the whole read aligned and free ends on the reference)
+	- The best alignment of the read, on the forward strand or the reverse complement, is reported with its score and CIGAR
+The reads are streamed from a FASTA or FASTQ file (see SeqReader) and can be aligned by a pool of processes that map the same index files.
+"""
+
+import mmap
+import os
+import tempfile
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from BWT import BWT
+from SeqReader import read_sequences
+
+Alignment = namedtuple("Alignment", ["read_id", "position", "strand", "score", "cigar", "read_start", "read_end"])
+Alignment.__doc__ = '''Best alignment of a read: position of the reference where it starts (None if the read is not aligned), strand ("+" or "-"),
+score, CIGAR (of the read in the strand of the alignment, with soft clips in local mode) and the aligned part [read_start, read_end) of the read'''
+
+_COMPLEMENT = str.maketrans("ACGTacgt", "TGCAtgca")
+_NEG = -1 << 30
+
+
+class ReadAligner:
+	def __init__(self, index: BWT, min_seed: int = 19, max_occ: int = 500, band: int = 16, candidates: int = 3, mode: str = "local",
+				 match: int = 1, mismatch: int = -4, gap: int = -6, both_strands: bool = True):
+		'''Initialization of the aligner over an index of the reference
+
+		Parameters
+		----------
+		index : BWT
+			Index of the reference (built or loaded)
+		min_seed : int, optional
+			Minimum length of the seeds, by default 19
+		max_occ : int, optional
+			Seeds with more occurrences (repeats) are skipped, by default 500
+		band : int, optional
+			Maximum distance to the diagonal of the candidate in the extension, the biggest indel that can be found, by default 16
+		candidates : int, optional
+			Number of candidate regions extended per strand, by default 3
+		mode : str, optional
+			"local" (Smith-Waterman) or "global" (Needleman-Wunsch on the whole read, free ends on the reference), by default "local".
+			The alignments never cross the separators of a MultiBWT, so in "global" mode a read that does not fit in one sequence is not aligned
+		match, mismatch, gap : int, optional
+			Scores of a match, a mismatch and each position of a gap, by default 1, -4 and -6
+		both_strands : bool, optional
+			If True, the reverse complement of the read is also aligned, by default True
+
+		Raises
+		------
+		ValueError
+			If the mode is not "local" nor "global", or the band is negative
+		'''
+		if mode not in ("local", "global"):
+			raise ValueError(f"Unknown mode: {mode}")
+		if band < 0:
+			raise ValueError("The band can not be negative")
+		self.index = index
+		self.min_seed, self.max_occ, self.band, self.candidates, self.mode = min_seed, max_occ, band, candidates, mode
+		self.match, self.mismatch, self.gap = match, mismatch, gap
+		self.both_strands = both_strands
+		self._ref = None
+
+	def _params(self) -> dict:
+		'''Auxiliary method with the parameters of the aligner, to build the same aligner in the workers'''
+		return {name: getattr(self, name) for name in ("min_seed", "max_occ", "band", "candidates", "mode", "match", "mismatch", "gap", "both_strands")}
+
+	@property
+	def reference(self) -> bytes:
+		'''Indexed text of the reference (rebuilt from the index only once), where the windows of the candidates are read'''
+		if self._ref is None:
+			self._ref = self.index._text().encode("latin-1")
+		return self._ref
+
+	def _candidates(self, read: str) -> list:
+		'''Auxiliary method with the diagonals (position of the indexed text where the read would start) of the best candidates, each with the position
+		of a seed occurrence on it: the diagonals of the seed occurrences closer than the band are grouped, and the groups are ranked by the length of their seeds'''
+		index = self.index
+		cover, hits = {}, {}
+		for start, end, lo, hi in index._smem_intervals(read, self.min_seed):
+			if hi - lo > self.max_occ:
+				continue
+			for r in range(lo, hi):
+				p = index._sa_value(r)
+				d = p - start
+				cover[d] = cover.get(d, 0) + end - start
+				hits[d] = p
+		groups = []																	# (cobertura total, cobertura da melhor diagonal, melhor diagonal, última diagonal)
+		for d in sorted(cover):
+			if groups and d - groups[-1][3] <= self.band:
+				total, best, diag, _ = groups[-1]
+				groups[-1] = (total + cover[d], max(best, cover[d]), diag if best >= cover[d] else d, d)
+			else:
+				groups.append((cover[d], cover[d], d, d))
+		groups.sort(key = lambda g: (-g[0], -g[1], g[2]))
+		return [(g[2], hits[g[2]]) for g in groups[:self.candidates]]
+
+	def _extend(self, read: bytes, diag: int, hit: int) -> tuple:
+		'''Auxiliary method of the banded alignment of the read against the window of the reference around a diagonal, inside the sequence of the seed
+		occurrence "hit" (the window never crosses the separators of a MultiBWT). Only the cells up to "band" columns away from the diagonal are computed
+		and kept (2*band + 1 per row of the read, with a border cell on each side), so the memory grows with the length of the read and not with its square.
+		Returns (score, reference start, cigar, read start, read end)'''
+		ref = self.reference
+		m, band, local = len(read), self.band, self.mode == "local"
+		match, mismatch, gap = self.match, self.mismatch, self.gap
+		start, end = self.index._bounds(hit)
+		ws, we = max(start, diag - band), min(end, diag + m + band)
+		window = ref[ws:we]
+		L, off = len(window), diag - ws													# Coluna da diagonal na linha i: i + off
+		W = 2*band + 3																	# Banda de cada linha e uma célula de cada lado: coluna j na posição j - i - off + band + 1
+
+		def cell(i: int, j: int) -> int:
+			k = j - i - off + band + 1
+			if 0 <= k < W:
+				return rows[i][k]
+			if j == 0 and (local or i + off - band <= 0):								# Coluna 0 fora da banda
+				return 0 if local else i*gap
+			return 0 if i == 0 and 0 <= j <= L else _NEG								# Linha 0: início livre na referência
+
+		rows = [[0 if 0 <= k + off - band - 1 <= L else _NEG for k in range(W)]]
+		best, bi, bj = (0, 0, 0) if local else (_NEG, 0, 0)
+		for i in range(1, m + 1):
+			a = read[i - 1]
+			base = i + off - band - 1													# Coluna da posição 0 da linha
+			lo, hi = max(1, base + 1), min(L, base + W - 2)
+			prev = rows[-1]
+			row = [_NEG]*W
+			if local:
+				if 0 <= -base < W:
+					row[-base] = 0
+			elif 1 <= -base < W:
+				row[-base] = i*gap															# Início do read inserido
+			rows.append(row)
+			if lo > hi:																	# Banda fora da sequência
+				continue
+			left = row[lo - 1 - base]
+			for j in range(lo, hi + 1):
+				k = j - base
+				s = prev[k] + (match if a == window[j - 1] else mismatch)
+				u = prev[k + 1] + gap
+				if u > s:
+					s = u
+				u = left + gap
+				if u > s:
+					s = u
+				if local:
+					if s < 0:
+						s = 0
+					elif s > best:
+						best, bi, bj = s, i, j
+				row[k] = left = s
+		if not local:
+			base = m + off - band - 1
+			cols = range(max(0, base), min(L, base + W - 1) + 1)
+			for j in ([] if 0 in cols else [0]) + list(cols):								# Coluna 0 (read todo inserido) mesmo fora da banda
+				if cell(m, j) > best:
+					best, bi, bj = cell(m, j), m, j
+		if best <= (0 if local else _NEG // 2):											# Sem alinhamento local com pontuação positiva
+			return None
+		ops = []
+		i, j = bi, bj
+		while i > 0 and not (local and cell(i, j) == 0):
+			h = cell(i, j)
+			if j > 0 and h == cell(i - 1, j - 1) + (match if read[i - 1] == window[j - 1] else mismatch):
+				ops.append("M")
+				i, j = i - 1, j - 1
+			elif h == cell(i - 1, j) + gap:
+				ops.append("I")
+				i -= 1
+			else:
+				ops.append("D")
+				j -= 1
+		return best, ws + j, _cigar(i, ops[::-1], m - bi), i, bi
+
+	def align(self, read, read_id: str = None) -> Alignment:
+		'''Method that aligns a read: the candidate regions of the seeds of each strand are extended and the best alignment is kept
+
+		Parameters
+		----------
+		read : str or Sequence
+			Sequence of the read
+		read_id : str, optional
+			Identifier of the read, by default the id of the Sequence (if given)
+
+		Returns
+		-------
+		Alignment
+			Best alignment of the read (with position None and score 0 if there is none)
+		'''
+		if not isinstance(read, str):
+			read_id = read.id if read_id is None else read_id
+			read = read.seq
+		read = read.upper()
+		strands = [("+", read)]
+		if self.both_strands:
+			strands.append(("-", read.translate(_COMPLEMENT)[::-1]))
+		best = None
+		for strand, seq in strands:
+			codes = seq.encode("latin-1")
+			for diag, hit in self._candidates(seq):
+				res = self._extend(codes, diag, hit)
+				if res is not None and (best is None or res[0] > best[1][0]):
+					best = (strand, res)
+		if best is None:
+			return Alignment(read_id, None, "+", 0, "", 0, 0)
+		strand, (score, start, cigar, qs, qe) = best
+		return Alignment(read_id, self.index._position(start), strand, score, cigar, qs, qe)
+
+	def align_file(self, path: str, processes: int = None, chunk_size: int = 64):
+		'''Method that aligns the reads of a FASTA or FASTQ file, streamed from the file. With several processes, the reads are sent in chunks
+		to workers that map the index files (the file of a loaded index or one written by BWT.save, the index of the reversed reference and the reference),
+		with a bounded number of chunks in flight
+
+		Parameters
+		----------
+		path : str
+			Path of the FASTA or FASTQ file (plain or gzip compressed)
+		processes : int, optional
+			Number of worker processes, by default None (alignment in this process)
+		chunk_size : int, optional
+			Number of reads sent to a worker at a time, by default 64
+
+		Yields
+		------
+		Alignment
+			Best alignment of each read, in the order of the file
+		'''
+		reads = ((r.id, r.seq) for r in read_sequences(path))
+		if not processes:
+			for read_id, seq in reads:
+				yield self.align(seq, read_id)
+			return
+		with tempfile.TemporaryDirectory() as tmp:
+			paths = self._write_files(tmp)
+			with ProcessPoolExecutor(processes, initializer = _init_worker, initargs = (type(self.index), paths, self._params())) as pool:
+				pending = deque()
+				for chunk in iter(lambda: list(islice(reads, chunk_size)), []):
+					pending.append(pool.submit(_align_worker, chunk))
+					if len(pending) >= 2*processes:
+						yield from pending.popleft().result()
+				while pending:
+					yield from pending.popleft().result()
+
+	def _write_files(self, folder: str) -> tuple:
+		'''Auxiliary method that writes the files mapped by the workers in the folder: the index (if it was not loaded from a file),
+		the index of the reversed reference and the reference'''
+		path = self.index.path
+		if path is None:
+			path = os.path.join(folder, "index.bwt")
+			self.index.save(path)
+		rev = os.path.join(folder, "reverse.bwt")
+		self.index._reverse_index().save(rev)
+		ref = os.path.join(folder, "reference")
+		with open(ref, "wb") as handle:
+			handle.write(self.reference)
+		return path, rev, ref
+
+
+def _cigar(clip: int, ops: list, tail: int) -> str:
+	'''Auxiliary function that writes the CIGAR of the operations of an alignment, with the soft clips of the ends of the read'''
+	res = f"{clip}S" if clip else ""
+	i = 0
+	while i < len(ops):
+		j = i
+		while j < len(ops) and ops[j] == ops[i]:
+			j += 1
+		res += f"{j - i}{ops[i]}"
+		i = j
+	return res + (f"{tail}S" if tail else "")
+
+
+_ALIGNER = None
+
+def _init_worker(cls: type, paths: tuple, params: dict):
+	'''Auxiliary function that maps the index files (of the class of the index, e.g. MultiBWT) and the reference in each worker process'''
+	global _ALIGNER
+	path, rev, ref = paths
+	index = cls.load(path)
+	index._reverse = BWT.load(rev)
+	_ALIGNER = ReadAligner(index, **params)
+	with open(ref, "rb") as handle:
+		_ALIGNER._ref = mmap.mmap(handle.fileno(), 0, access = mmap.ACCESS_READ)
+
+def _align_worker(reads: list) -> list:
+	'''Auxiliary function (run in the workers) that aligns a chunk of reads'''
+	return [_ALIGNER.align(seq, read_id) for read_id, seq in reads]
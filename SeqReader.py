@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright 2022 by Group 7 (MSc Bioinformatics - University of Minho).  All rights reserved.
+
+"""
+This module provides generators that read FASTA and FASTQ files lazily, yielding one :class:`Sequence` at a time.
+The files are read in fixed size chunks, so only the record being built is held in memory, which allows big read sets to be processed record by record:
+    - read_fasta(): yields the records of a FASTA file
+    - read_fastq(): yields the records of a FASTQ file, with the corresponding qualities
+    - read_sequences(): detects the format of the file and yields its records
+Files compressed with gzip are detected and decompressed on the fly.
+"""
+
+import gzip
+from Sequence import Sequence
+
+CHUNK_SIZE = 1 << 16
+
+
+def _open(path: str):
+    '''Auxiliary function that opens a (possibly gzip compressed) file in binary mode
+
+    Parameters
+    ----------
+    path : str
+        Path of the file
+
+    Returns
+    -------
+    file
+        Binary file object
+    '''
+    with open(path, "rb") as handle:
+        magic = handle.read(2)
+    if magic == b"\x1f\x8b":
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def _iter_lines(path: str, chunk_size: int = CHUNK_SIZE):
+    '''Auxiliary generator that reads the file in chunks of "chunk_size" bytes and yields its lines without the line terminator
+
+    Parameters
+    ----------
+    path : str
+        Path of the file
+    chunk_size : int, optional
+        Number of bytes read at a time, by default 64 KiB
+
+    Yields
+    ------
+    str
+        Line of the file
+    '''
+    with _open(path) as handle:
+        pending = []                                    # Pedaços da linha em curso (linhas muito longas não são copiadas a cada chunk)
+        while True:
+            chunk = handle.read(chunk_size)
+            if not chunk:
+                break
+            lines = chunk.split(b"\n")
+            if len(lines) == 1:
+                pending.append(chunk)
+                continue
+            pending.append(lines[0])
+            lines[0] = b"".join(pending)
+            pending = [lines.pop()]
+            for line in lines:
+                yield line.rstrip(b"\r").decode("ascii")
+        rest = b"".join(pending)
+        if rest:
+            yield rest.rstrip(b"\r").decode("ascii")
+
+
+def read_fasta(path: str, chunk_size: int = CHUNK_SIZE):
+    '''Generator of the records of a FASTA file. The identifier of each record is the first word of its header
+
+    Parameters
+    ----------
+    path : str
+        Path of the FASTA file (plain or gzip compressed)
+    chunk_size : int, optional
+        Number of bytes read at a time, by default 64 KiB
+
+    Yields
+    ------
+    Sequence
+        Sequence of each record, with the "id" attribute filled
+
+    Raises
+    ------
+    ValueError
+        If the file does not start with a FASTA header
+    '''
+    seq_id = None
+    parts = []
+    for line in _iter_lines(path, chunk_size):
+        if line.startswith(">"):
+            if seq_id is not None:
+                yield Sequence("".join(parts), id = seq_id)
+            seq_id = line[1:].split(maxsplit = 1)[0] if line[1:].strip() else ""
+            parts = []
+        elif seq_id is None:
+            if line.strip():
+                raise ValueError("Invalid FASTA file: sequence found before the first header")
+        else:
+            parts.append(line.strip())
+    if seq_id is not None:
+        yield Sequence("".join(parts), id = seq_id)
+
+
+def read_fastq(path: str, chunk_size: int = CHUNK_SIZE):
+    '''Generator of the records of a FASTQ file (4 lines per record)
+
+    Parameters
+    ----------
+    path : str
+        Path of the FASTQ file (plain or gzip compressed)
+    chunk_size : int, optional
+        Number of bytes read at a time, by default 64 KiB
+
+    Yields
+    ------
+    Sequence
+        Sequence of each read, with the "id" and "qualities" attributes filled
+
+    Raises
+    ------
+    ValueError
+        If a record is truncated, malformed or the qualities do not match the sequence length
+    '''
+    lines = _iter_lines(path, chunk_size)
+    for header in lines:
+        if not header.strip():
+            continue
+        if not header.startswith("@"):
+            raise ValueError(f"Invalid FASTQ record header: {header}")
+        record = [next(lines, None) for _ in range(3)]
+        if None in record or not record[1].startswith("+"):
+            raise ValueError(f"Truncated or malformed FASTQ record: {header}")
+        seq, _, qual = record
+        if len(seq) != len(qual):
+            raise ValueError(f"Sequence and qualities of different lengths: {header}")
+        seq_id = header[1:].split(maxsplit = 1)[0] if header[1:].strip() else ""
+        yield Sequence(seq, id = seq_id, qualities = qual)
+
+
+def read_sequences(path: str, chunk_size: int = CHUNK_SIZE):
+    '''Generator of the records of a FASTA or FASTQ file, with the format detected from the first character of the file
+
+    Parameters
+    ----------
+    path : str
+        Path of the file (plain or gzip compressed)
+    chunk_size : int, optional
+        Number of bytes read at a time, by default 64 KiB
+
+    Yields
+    ------
+    Sequence
+        Sequence of each record
+
+    Raises
+    ------
+    ValueError
+        If the format of the file is not recognized
+    '''
+    lines = _iter_lines(path, chunk_size)
+    first = next((l for l in lines if l.strip()), None)
+    lines.close()
+    if first is None:
+        return
+    if first.startswith(">"):
+        yield from read_fasta(path, chunk_size)
+    elif first.startswith("@"):
+        yield from read_fastq(path, chunk_size)
+    else:
+        raise ValueError("Unknown file format: expected FASTA ('>') or FASTQ ('@')")
@@ -7,10 +7,193 @@ This module provides the :class:`Sequence` class, for verifying sequences and de
 This class includes diverse methods, including: transcription, comp_inverse, transcript, get_orfs, translation, get_all_prots, and others.
 """
 
+import inspect
 import re
+from collections import OrderedDict, namedtuple
+from functools import wraps
+from GeneticCode import get_code
+import Kmers
+import ParallelTranslation
+import WindowStats
+
+# Alfabetos pela ordem de classificação: uma sequência só com "ACG" é DNA
+ALPHABETS = (("DNA", b"ACGT-"), ("RNA", b"ACGU-"), ("AMINO", b"FLIMVSPTAY_HQNKDECWRG-"))
+
+ORF = namedtuple("ORF", ["frame", "start", "end", "protein"])
+ORF.__doc__ = '''Open reading frame found by Sequence.iter_orfs: frame (+1, +2, +3, -1, -2, -3), start and end (0-based, end exclusive, stop codon included) on the forward strand and protein'''
+
+
+def _protein_spans(aa: str, nested: bool = False):
+    '''
+    Auxiliary generator of the proteins of an amino acid chain: each protein starts in a "M" and ends in the next stop "_"
+    Jumps between the "M" and "_" with str.find instead of walking the chain character by character
+    
+    Parameters
+    ----------
+    aa: str
+        Amino acid chain
+    nested: bool
+        If True, every "M" before a stop starts a protein. If False only the first one (outermost protein), by default False
+    
+    Yields
+    ------------
+    tuple
+        Start and end (exclusive, stop included) indexes of each protein in the chain
+    '''
+    find = aa.find
+    pos = 0
+    while True:
+        start = find("M", pos)
+        if start == -1:
+            return
+        stop = find("_", start)
+        if stop == -1:
+            return
+        yield start, stop + 1
+        if nested:
+            inner = find("M", start + 1, stop)
+            while inner != -1:
+                yield inner, stop + 1
+                inner = find("M", inner + 1, stop)
+        pos = stop + 1
+
+
+def classify(seq) -> str:
+    '''
+    Determines the type of a sequence (DNA, RNA or AMINO) in a single pass per alphabet over its bytes: the characters of the 
+    alphabet are deleted with bytes.translate and the sequence belongs to the alphabet if nothing is left
+    
+    Parameters
+    ----------
+    seq: str or bytes
+        Sequence to classify (case insensitive)
+    
+    Returns
+    ------------
+    str
+        Type of the sequence ('DNA', 'RNA' or 'AMINO')
+    
+    Raises
+    ------------
+    TypeError
+        If the sequence does not belong to any of the alphabets
+    '''
+    if isinstance(seq, str):
+        try:
+            seq = seq.encode("ascii")
+        except UnicodeEncodeError:
+            raise TypeError("Invalid input string!")
+    seq = seq.upper()
+    for name, abc in ALPHABETS:
+        if not seq.translate(None, abc):
+            return name
+    raise TypeError("Invalid input string!")
+
+
+def validate_many(seqs: list) -> list:
+    '''
+    Bulk validation of a list of sequences
+    
+    Parameters
+    ----------
+    seqs: list
+        Sequences (str or bytes) to classify
+    
+    Returns
+    ------------
+    list
+        Type of each sequence ('DNA', 'RNA' or 'AMINO')
+    
+    Raises
+    ------------
+    TypeError
+        If any of the sequences does not belong to any of the alphabets
+    '''
+    return [classify(s) for s in seqs]
+
+
+class _DerivedCache:
+    '''LRU cache of the products derived from a sequence, bounded by the total number of characters kept'''
+    def __init__(self, seq: str, maxsize: int) -> None:
+        self.seq = seq
+        self.maxsize = maxsize
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.entries = OrderedDict()
+
+    @staticmethod
+    def _sizeof(value) -> int:
+        '''Number of characters of a product (strings, lists and dictionaries of strings or lists)'''
+        if isinstance(value, str):
+            return len(value)
+        if isinstance(value, dict):
+            return sum(_DerivedCache._sizeof(v) for v in value.values())
+        if isinstance(value, (list, tuple)):
+            return sum(_DerivedCache._sizeof(v) for v in value)
+        return 1
+
+    def clear(self):
+        '''Discards all the products'''
+        self.entries.clear()
+        self.size = 0
+
+    def get(self, key: tuple):
+        '''Obtaining of a product: returns (True, product) if it is in the cache, (False, None) otherwise'''
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return True, self.entries[key][0]
+        self.misses += 1
+        return False, None
+
+    def put(self, key: tuple, value):
+        '''Addition of a product, discarding the least recently used ones until it fits'''
+        size = self._sizeof(value)
+        if size > self.maxsize:
+            return
+        while self.entries and self.size + size > self.maxsize:
+            _, (_, old) = self.entries.popitem(last = False)
+            self.size -= old
+        self.entries[key] = (value, size)
+        self.size += size
+
+
+def _copy(value):
+    '''Auxiliary function that copies the lists and dictionaries returned by the cache, so the callers cannot change the cached products'''
+    if isinstance(value, dict):
+        return {k: _copy(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return list(value)
+    return value
+
+
+def _cached(method):
+    '''Decorator of the methods whose result is kept in the cache of derived products of the sequence (when enabled).
+    The key has the value of every argument (defaults included), without "processes" and "chunk_size" (the serial and parallel results are the same)'''
+    signature = inspect.signature(method)
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = getattr(self, "_cache", None)
+        if cache is None:
+            return method(self, *args, **kwargs)
+        if cache.seq is not self.seq:                           # Sequência alterada: os produtos guardados já não são válidos
+            cache.clear()
+            cache.seq = self.seq
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = (method.__name__, tuple((name, v) for name, v in bound.arguments.items() if name not in ("self", "processes", "chunk_size")))
+        found, value = cache.get(key)
+        if not found:
+            value = method(self, *args, **kwargs)
+            cache.put(key, value)
+        return _copy(value)
+    return wrapper
+
 
 class Sequence:
-    def __init__(self, seq: str) -> None:
+    def __init__(self, seq: str, id: str = None, qualities: str = None, check: str = None) -> None:
         '''
         Verifies and capitalizes the sequence inputted by the user implementing an error in case the sequence submitted is invalid
         
@@ -18,20 +201,84 @@ class Sequence:
         ------------
         seq: str
             Sequence inputted by the user
+        id: str
+            Identifier of the sequence (e.g. FASTA/FASTQ header), by default None
+        qualities: str
+            Phred quality string of the sequence (FASTQ), by default None
+        check: str
+            Type of the sequence ('DNA', 'RNA' or 'AMINO') when already known (trusted input). The validation is skipped, by default None
         '''
         self.seq = seq.upper()
-        dna = "ACGT-"
-        rna = "ACGU-"
-        amino = "FLIMVSPTAY_HQNKDECWRG-"
-        
-        if all (i in dna for i in self.seq) is True:
-            self.check = "DNA"
-        elif all (i in rna for i in self.seq) is True:
-            self.check = "RNA"
-        elif all (i in amino for i in self.seq) is True:
-            self.check = "AMINO"
+        self.id = id
+        self.qualities = qualities
+        self._cache = None
+        
+        if check is None:
+            self.check = classify(self.seq)
+        elif check in ("DNA", "RNA", "AMINO"):
+            self.check = check
         else:
-            raise TypeError("Invalid input string!")
+            raise TypeError(f"Invalid sequence type: {check}")
+    
+    @classmethod
+    def from_file(cls, path: str, check: str = None) -> "Sequence":
+        '''
+        Opening of a flat or single record FASTA file through mmap, without reading the sequence into a string
+        
+        Parameters
+        ------------
+        path: str
+            Path of the file
+        check: str
+            Type of the sequence when already known (trusted input). The validation is skipped, by default None
+        
+        Returns
+        ------------
+        MappedSequence
+            Sequence backed by the mapped file (see MappedSequence)
+        '''
+        from MappedSequence import MappedSequence
+        return MappedSequence(path, check = check)
+            
+    def enable_cache(self, maxsize: int = 1 << 24):
+        '''
+        Enables the cache of the products derived from the sequence (inverse complement, ORFs, translations and proteins),
+        so they are only computed once. The cache is cleared if the sequence is changed
+        
+        Parameters
+        ------------
+        maxsize: int
+            Maximum number of characters kept in the cache (least recently used products are discarded first), by default 16M
+        '''
+        self._cache = _DerivedCache(self.seq, maxsize)
+    
+    def disable_cache(self):
+        '''
+        Disables and discards the cache of derived products
+        '''
+        self._cache = None
+    
+    def clear_cache(self):
+        '''
+        Discards the products kept in the cache, keeping it enabled
+        '''
+        if getattr(self, "_cache", None) is not None:
+            self._cache.clear()
+    
+    def cache_info(self) -> dict:
+        '''
+        Information about the cache of derived products
+        
+        Returns
+        ------------
+        dict
+            Dictionary with the hits, misses, maximum size, current size (characters) and the products kept (method and its arguments as (name, value) pairs),
+            or None if the cache is not enabled
+        '''
+        cache = getattr(self, "_cache", None)
+        if cache is None:
+            return None
+        return {"hits": cache.hits, "misses": cache.misses, "maxsize": cache.maxsize, "size": cache.size, "entries": list(cache.entries)}
             
     def __str__(self) -> str:
         '''
@@ -106,6 +353,27 @@ class Sequence:
         return f"{count[n.upper()]}%"
         
     
+    def window_stats(self, window: int, step: int = None, codons: bool = False):
+        '''
+        Composition statistics (counts, percentages, GC content, GC skew and codon usage) of sliding windows of the sequence,
+        with the counts updated as the bases enter and leave the window
+        
+        Parameters
+        ----------
+        window: int
+            Size of the windows
+        step: int
+            Distance between the start of consecutive windows, by default equal to the window
+        codons: bool
+            If True, the codon usage of the first reading frame inside each window is also reported, by default False
+        
+        Yields
+        ------------
+        WindowStats.Window
+            Statistics of each complete window
+        '''
+        return WindowStats.sliding_windows(self.seq, window, step, codons)
+    
     def transcription(self) -> str:
         '''
         Replacing of the thymine base 'T' for the uracil base 'U'
@@ -131,6 +399,7 @@ class Sequence:
              raise Exception()
     
     
+    @_cached
     def comp_inverse(self) -> str:
         '''
         Inversion and complementarity of the sequence
@@ -179,6 +448,7 @@ class Sequence:
         
         return new
     
+    @_cached
     def get_orfs(self) -> dict:
         '''
         Construction of a dictionary with all the 6 orfs (3 of each chain)
@@ -226,16 +496,21 @@ class Sequence:
         assert self.check == "DNA", "Introduced sequence must be DNA!"
         return re.findall("(...)", self.seq) #aqui devia dar para fazer codoes das outras sequencias (invertidas e assim)
     
-    def translation(self) -> str:
+    @_cached
+    def translation(self, table: int = 1, processes: int = None, chunk_size: int = None) -> str:
         '''
         Obtaining the sequence codons and building an amino acid chain across the codons
-        Transforms codons into amino acids through a dictionary with the relevant information
+        Transforms codons into amino acids through a precompiled 64 codons lookup of the genetic code
         Only executes in case the object is a DNA sequence
         
         Parameters
         ----------
-        seq: str
-            DNA sequence
+        table: int
+            NCBI identifier of the genetic code, by default 1 (Standard)
+        processes: int
+            If given, the sequence is translated in chunks by a pool of this number of processes (see ParallelTranslation), by default None (serial)
+        chunk_size: int
+            Number of bases of each chunk in the parallel mode, by default chosen from the length and the number of processes
         
         Returns
         ------------
@@ -243,31 +518,28 @@ class Sequence:
             Amino acid chain string resulting from the translation of the DNA sequence
         '''
         assert self.check == "DNA", "Introduced sequence must be DNA!"
-        amino_codons = {"F":["TTT", "TTC"], "L":["TTA", "TTG", "CTT", "CTC", "CTA", "CTG"], "I":["ATT", "ATC", "ATA"], "M":"ATG", "V":["GTT", "GTC", "GTA", "GTG"], "S":["TCT", "TCC", "TCA", "TCG", "AGT", "AGC"], "P":["CCT", "CCC", "CCA", "CCG"], "T":["ACT", "ACC", "ACA", "ACG"], "A":["GCT", "GCC", "GCA", "GCG"], "Y":["TAT", "TAC"], "_":["TAA", "TAG", "TGA"], "H":["CAT", "CAC"], "Q":["CAA", "CAG"], "N":["AAT", "AAC"], "K":["AAA", "AAG"], "D":["GAT", "GAC"], "E":["GAA", "GAG"], "C":["TGT", "TGC"], "W":"TGG", "R":["CGT", "CGC", "CGA", "CGG", "AGA", "AGG"], "G":["GGT", "GGC", "GGA", "GGG"]}
-        aa = ""
-        codons = Sequence.get_codons(self) 
         
         if self.seq:
-            for codon in codons:
-                for amino, codoes in amino_codons.items():
-                    if codon in codoes:
-                        aa += amino
-        
-            return aa
+            if processes:
+                return ParallelTranslation.translate(self.seq, table, processes, chunk_size)
+            return get_code(table).translate(self.seq)
         
         else:
              raise Exception()
     
     
-    def get_all_prots(self) -> list:
+    @_cached
+    def get_all_prots(self, processes: int = None, chunk_size: int = None) -> list:
         '''
         Construction of a list with all the existing and possible proteins in the sequence. The sequence can be proteic or DNA
         Only executes in case the object is a DNA or AMINO sequence
         
         Parameters
         ----------
-        seq : str
-            DNA or amino sequence
+        processes: int
+            If given, a DNA sequence is translated and scanned in chunks by a pool of this number of processes (see ParallelTranslation), by default None (serial)
+        chunk_size: int
+            Number of bases of each chunk in the parallel mode, by default chosen from the length and the number of processes
 
         Returns
         ------------
@@ -276,67 +548,54 @@ class Sequence:
         '''
         assert self.check == "DNA" or self.check == "AMINO", "Introduced sequence must be DNA or AMINO!"
         
-        list_prots = []
-        
         if self.check == "DNA":
+            if processes and self.seq:
+                return ParallelTranslation.all_prots(self.seq, processes = processes, chunk_size = chunk_size)
             aa = Sequence.translation(self)
-            boolean = False
-            proteina = ""
-            for i in aa:
-                if i == "M": #Aqui como repete em baixo, devia ser uma função auxiliar que é chamada nos dois sitios
-                    proteina += i
-                    boolean = True
-                elif i == "_" and boolean is True:
-                    proteina += i
-                    boolean = False
-                    list_prots.append(proteina)
-                    proteina = ""
-                elif boolean is True:
-                    proteina += i
-        
-        elif self.check == "AMINO":
-            boolean = False
-            proteina = ""
-            for i in self.seq:
-                if i == "M":
-                    proteina += i
-                    boolean = True
-                elif i == "_" and boolean is True:
-                    proteina += i
-                    boolean = False
-                    list_prots.append(proteina)
-                    proteina = ""
-                elif boolean is True:
-                    proteina += i
-                
-        return list_prots
-        
-    def get_bigger_prot(self) -> str:
-        '''
-        Getting the bigger protein in the sequence
+        else:
+            aa = self.seq
+        
+        return [aa[i:j] for i, j in _protein_spans(aa)]
+        
+    @_cached
+    def get_bigger_prot(self, processes: int = None, chunk_size: int = None) -> str:
+        '''
+        Getting the bigger protein in the sequence (the first of the longest proteins of the DNA or the amino acid chain)
+        
+        Parameters
+        ----------
+        processes: int
+            If given, a DNA sequence is translated and scanned in chunks by a pool of this number of processes (see ParallelTranslation), by default None (serial)
+        chunk_size: int
+            Number of bases of each chunk in the parallel mode, by default chosen from the length and the number of processes
         
         Returns
         ------------
         str
             String with the bigger protein
         '''
-        list = self.get_all_prots()
-        bigger = ""
-        for p in list:
-            if len(p)>len(bigger):
-                bigger = p
-        return bigger
+        assert self.check == "DNA" or self.check == "AMINO", "Introduced sequence must be DNA or AMINO!"
+        
+        if self.check == "DNA":
+            if processes:
+                return max(self.get_all_prots(processes, chunk_size), key = len, default = "")
+            aa = get_code(1).translate(self.seq, 0, unknown = "X")
+            span = max(_protein_spans(aa), key = lambda s: s[1] - s[0] - aa.count("X", *s), default = None)     # Comprimento sem os codões desconhecidos
+            return "" if span is None else aa[span[0]:span[1]].replace("X", "")
+        
+        return max((self.seq[i:j] for i, j in _protein_spans(self.seq)), key = len, default = "")
     
-    def get_aa_orfs(self) -> dict:
+    @_cached
+    def get_aa_orfs(self, table: int = 1) -> dict:
         '''
         Construction of a dictionary with all the ORFs and the corresponding chain of amino acids
-        Transforms codons into amino acids through a dictionary with the relevant information
+        Transforms codons into amino acids through a precompiled 64 codons lookup of the genetic code
         Only executes in case the object is a DNA sequence
 
         Parameters
         ----------
-        seq: str
-            DNA sequence     
+        table: int
+            NCBI identifier of the genetic code, by default 1 (Standard)
 
         Returns
         ------------
@@ -344,20 +603,104 @@ class Sequence:
             Returns a dictionary with the ORFs and amino acid chain
         '''
         assert self.check == "DNA", "Introduced sequence must be DNA!"
-        orfs = Sequence.get_orfs(self)
-        amino_codons = {"F":["TTT", "TTC"], "L":["TTA", "TTG", "CTT", "CTC", "CTA", "CTG"], "I":["ATT", "ATC", "ATA"], "M":"ATG", "V":["GTT", "GTC", "GTA", "GTG"], "S":["TCT", "TCC", "TCA", "TCG", "AGT", "AGC"], "P":["CCT", "CCC", "CCA", "CCG"], "T":["ACT", "ACC", "ACA", "ACG"], "A":["GCT", "GCC", "GCA", "GCG"], "Y":["TAT", "TAC"], "_":["TAA", "TAG", "TGA"], "H":["CAT", "CAC"], "Q":["CAA", "CAG"], "N":["AAT", "AAC"], "K":["AAA", "AAG"], "D":["GAT", "GAC"], "E":["GAA", "GAG"], "C":["TGT", "TGC"], "W":"TGG", "R":["CGT", "CGC", "CGA", "CGG", "AGA", "AGG"], "G":["GGT", "GGC", "GGA", "GGG"]}
+        code = get_code(table)
+        seq_rev = Sequence.comp_inverse(self)
         
         orfs_aa = {"ORF +1": None, "ORF +2": None, "ORF +3": None, "ORF -1": None, "ORF -2": None, "ORF -3": None}
-        for c, v in orfs.items():
-            aa = ""
-            for codon in v:
-                for amino, codons in amino_codons.items():
-                    if codon in codons: aa += amino
-            orfs_aa[c] = aa
+        for frame in range(3):
+            orfs_aa[f"ORF +{frame + 1}"] = code.translate(self.seq, frame)
+            orfs_aa[f"ORF -{frame + 1}"] = code.translate(seq_rev, frame)
         
         return orfs_aa
    
     
+    def iter_orfs(self, min_length: int = 0, nested: bool = False, frames: tuple = (1, 2, 3, -1, -2, -3), table: int = 1, proteins: bool = True):
+        '''
+        Streaming scanner of the open reading frames (ORFs) of the six frames. Each strand is translated once per frame and the proteins are located with 
+        str.find between the "M" and the stops, without building lists of codons. The reverse strand is only computed if a reverse frame is asked
+        Only executes in case the object is a DNA sequence
+        
+        Parameters
+        ----------
+        min_length: int
+            Minimum number of codons of the ORF (stop codon included), by default 0
+        nested: bool
+            If True, the ORFs that start in an inner "M" of another ORF are also reported. If False only the outermost ORF, by default False
+        frames: tuple
+            Frames to scan (+1, +2, +3, -1, -2, -3), by default all
+        table: int
+            NCBI identifier of the genetic code, by default 1 (Standard)
+        proteins: bool
+            If False, the protein of each ORF is not built (None), by default True
+        
+        Yields
+        ------------
+        ORF
+            Record (frame, start, end, protein) of each ORF, with start and end in forward strand coordinates
+        '''
+        assert self.check == "DNA", "Introduced sequence must be DNA!"
+        code = get_code(table)
+        n = len(self.seq)
+        seq_rev = None
+        for frame in frames:
+            offset = abs(frame) - 1
+            if frame > 0:
+                aa = code.translate(self.seq, offset, unknown = "X")
+            else:
+                if seq_rev is None:
+                    seq_rev = Sequence.comp_inverse(self)
+                aa = code.translate(seq_rev, offset, unknown = "X")
+            for i, j in _protein_spans(aa, nested):
+                if j - i < min_length:
+                    continue
+                start, end = offset + 3*i, offset + 3*j
+                if frame < 0:
+                    start, end = n - end, n - start
+                yield ORF(frame, start, end, aa[i:j].replace("X", "") if proteins else None)
+    
+    def iter_kmers(self, k: int, canonical: bool = False):
+        '''
+        Iteration over the k-mers of the sequence as 2 bits per base integer codes (k up to 31), updated by a rolling shift
+        Only executes in case the object is a DNA or RNA sequence
+        
+        Parameters
+        ----------
+        k: int
+            Size of the k-mers
+        canonical: bool
+            If True, yields the smallest code between the k-mer and its inverse complement, by default False
+        
+        Yields
+        ------------
+        int
+            Code of each k-mer (see Kmers.decode_kmer)
+        '''
+        assert self.check == "DNA" or self.check == "RNA", "Introduced sequence must be DNA or RNA!"
+        return Kmers.iter_kmers(self.seq, k, canonical)
+    
+    def kmer_counts(self, k: int, canonical: bool = False, decode: bool = False) -> dict:
+        '''
+        Counting of the k-mers of the sequence in a hash table of integer codes
+        Only executes in case the object is a DNA or RNA sequence
+        
+        Parameters
+        ----------
+        k: int
+            Size of the k-mers
+        canonical: bool
+            If True, a k-mer and its inverse complement are counted together, by default False
+        decode: bool
+            If True, the keys are the k-mer strings (as used by DeBruijnGraph, OverlapGraph and Motifs), with "U" instead of "T" for RNA, by default False
+        
+        Returns
+        ------------
+        dict
+            Dictionary with the k-mers and the number of occurrences
+        '''
+        assert self.check == "DNA" or self.check == "RNA", "Introduced sequence must be DNA or RNA!"
+        return Kmers.kmer_counts(self.seq, k, canonical, decode, self.check)
+    
+    @_cached
     def get_all_prots_orfs(self) -> dict:
         '''
         Construction of a dictionary with all the ORFs and the corresponding list with all the existing and possible proteins in the sequence ORF
@@ -374,26 +717,9 @@ class Sequence:
             Returns a dictionary with the ORFs and possible proteins
         '''
         assert self.check == "DNA", "Introduced sequence must be DNA!"
-        orfs_aa = Sequence.get_aa_orfs(self)
-        
-        orfs_prot = {"ORF +1": None, "ORF +2": None, "ORF +3": None, "ORF -1": None, "ORF -2": None, "ORF -3": None}
-        for c, aa in orfs_aa.items():
-            boolean = False
-            proteina = ""
-            list_prots = []
-            for i in aa:
-                if i == "M": #outra vez o mesmo codigo que está acima, devia ter a tal 
-                    proteina += i
-                    boolean = True
-                elif i == "_" and boolean is True:
-                    proteina += i
-                    boolean = False
-                    list_prots.append(proteina)
-                    proteina = ""
-                elif boolean is True:
-                    proteina += i
-                    
-            orfs_prot[c] = list_prots
+        
+        orfs_prot = {"ORF +1": [], "ORF +2": [], "ORF +3": [], "ORF -1": [], "ORF -2": [], "ORF -3": []}
+        for orf in self.iter_orfs():
+            orfs_prot[f"ORF {orf.frame:+d}"].append(orf.protein)
             
         return orfs_prot
-
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright 2022 by Group 7 (MSc Bioinformatics - University of Minho).  All rights reserved.
+
+"""
+This module provides the :class:`SequenceBatch` class, a container of many sequences of the same type stored in a single contiguous buffer.
+Sequence i occupies the bytes between offsets[i] and offsets[i+1] of the buffer. The operations run over the whole batch at once:
+    - composition() and percentage(): base counts and percentages of every sequence, returned as arrays (one per base)
+    - comp_inverse(): complement of the whole buffer with a single bytes.translate, followed by the reversal
+    - transcription(): replacement of "T" by "U" in the whole buffer
+    - translation(): translation of every sequence through the precompiled genetic code
+"""
+
+from array import array
+from GeneticCode import get_code
+from Sequence import ALPHABETS, Sequence
+
+_COMPLEMENT = bytes.maketrans(b"ACGT", b"TGCA")
+
+
+class SequenceBatch:
+    def __init__(self, seqs: list, check: str = None) -> None:
+        '''
+        Construction of the buffer and offsets of a list of sequences, each of them validated (all of the same type)
+
+        Parameters
+        ------------
+        seqs: list
+            Sequences (str or Sequence) of the batch
+        check: str
+            Type of the sequences ('DNA', 'RNA' or 'AMINO') when already known (trusted input). The validation is skipped, by default None
+
+        Raises
+        ------------
+        TypeError
+            If a sequence is invalid or the sequences are not all of the same type
+        '''
+        parts = [(s.seq if isinstance(s, Sequence) else s).upper().encode("ascii") for s in seqs]
+        self.offsets = array("q", [0])
+        total = 0
+        for p in parts:
+            total += len(p)
+            self.offsets.append(total)
+        self.buffer = b"".join(parts)
+        self.check = self._classify(parts) if check is None else check
+
+    @staticmethod
+    def _classify(parts: list) -> str:
+        '''Auxiliary method that keeps the alphabets where every sequence fits (as MappedSequence._classify does with the chunks), so that a short
+        sequence that fits several alphabets (e.g. an RNA read without "U") takes the type of the others. The empty sequences fit any type'''
+        candidates = list(ALPHABETS)
+        for i, p in enumerate(parts):
+            fits = [(name, abc) for name, abc in ALPHABETS if not p.translate(None, abc)]
+            if not fits:
+                raise TypeError(f"Invalid sequence {i} in the batch")
+            shared = [c for c in candidates if c in fits]
+            if not shared:
+                own, previous = (" or ".join(name for name, _ in cs) for cs in (fits, candidates))
+                raise TypeError(f"Sequence {i} is {own}, but the previous sequences are {previous}: the sequences of a batch must be of the same type")
+            candidates = shared
+        return candidates[0][0]
+
+    @classmethod
+    def _from_buffer(cls, buffer: bytes, offsets: array, check: str) -> "SequenceBatch":
+        '''Auxiliary constructor from an already built buffer and offsets'''
+        new = cls.__new__(cls)
+        new.buffer = buffer
+        new.offsets = offsets
+        new.check = check
+        return new
+
+    def __len__(self) -> int:
+        '''
+        Number of sequences of the batch
+
+        Returns
+        ------------
+        int
+            Number of sequences
+        '''
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        '''
+        Sequence with index i of the batch
+
+        Returns
+        ------------
+        str
+            Sequence i
+        '''
+        if i < 0:
+            i += len(self)
+        return self.buffer[self.offsets[i]:self.offsets[i + 1]].decode("ascii")
+
+    def __iter__(self):
+        buffer = self.buffer.decode("ascii")
+        for a, b in zip(self.offsets, self.offsets[1:]):
+            yield buffer[a:b]
+
+    def to_list(self) -> list:
+        '''
+        Sequences of the batch as a list of strings
+
+        Returns
+        ------------
+        list
+            List of sequences
+        '''
+        return list(self)
+
+    def sequence(self, i: int) -> Sequence:
+        '''
+        Sequence with index i of the batch as a Sequence object (not validated again)
+
+        Returns
+        ------------
+        Sequence
+            Sequence i
+        '''
+        return Sequence(self[i], check = self.check)
+
+    def lengths(self) -> array:
+        '''
+        Lengths of the sequences of the batch
+
+        Returns
+        ------------
+        array
+            Array with the length of each sequence
+        '''
+        return array("q", [b - a for a, b in zip(self.offsets, self.offsets[1:])])
+
+    def composition(self) -> dict:
+        '''
+        Counting of the characters of the alphabet of the batch in every sequence
+
+        Returns
+        ------------
+        dict
+            Dictionary with each character and the array of its counts in each sequence
+        '''
+        abc = dict(ALPHABETS)[self.check]
+        counts = {chr(c): array("q", bytes(8*len(self))) for c in abc}
+        buffer, offsets = self.buffer, self.offsets
+        for i in range(len(self)):
+            rec = buffer[offsets[i]:offsets[i + 1]]
+            for c in abc:
+                counts[chr(c)][i] = rec.count(c)
+        return counts
+
+    def percentage(self) -> dict:
+        '''
+        Percentage of each character of the alphabet in every sequence, rounded as in Sequence.percentage
+
+        Returns
+        ------------
+        dict
+            Dictionary with each character and the array of its percentage in each sequence (0 for empty sequences)
+        '''
+        lengths = self.lengths()
+        return {c: array("d", [round(v/n, 3)*100 if n else 0.0 for v, n in zip(counts, lengths)]) for c, counts in self.composition().items()}
+
+    def transcription(self) -> "SequenceBatch":
+        '''
+        Replacing of the thymine base 'T' for the uracil base 'U' in all the sequences
+        Only executes in case the batch is of DNA sequences
+
+        Returns
+        ------------
+        SequenceBatch
+            Batch of RNA sequences
+        '''
+        assert self.check == "DNA", "Introduced sequences must be DNA!"
+        return SequenceBatch._from_buffer(self.buffer.replace(b"T", b"U"), array("q", self.offsets), "RNA")
+
+    def comp_inverse(self) -> "SequenceBatch":
+        '''
+        Inversion and complementarity of all the sequences. The reversed buffer has the sequences in the inverse order,
+        which is restored with a slice per sequence
+        Only executes in case the batch is of DNA sequences
+
+        Returns
+        ------------
+        SequenceBatch
+            Batch with the inverse and complement of each sequence, in the same order
+        '''
+        assert self.check == "DNA", "Introduced sequences must be DNA!"
+        rev = self.buffer.translate(_COMPLEMENT)[::-1]
+        total = len(rev)
+        offsets = self.offsets
+        buffer = b"".join([rev[total - offsets[i + 1]:total - offsets[i]] for i in range(len(self))])
+        return SequenceBatch._from_buffer(buffer, array("q", offsets), "DNA")
+
+    def translation(self, table: int = 1) -> "SequenceBatch":
+        '''
+        Translation of the first reading frame of all the sequences
+        Only executes in case the batch is of DNA sequences
+
+        Parameters
+        ----------
+        table: int
+            NCBI identifier of the genetic code, by default 1 (Standard)
+
+        Returns
+        ------------
+        SequenceBatch
+            Batch with the amino acid chain of each sequence
+        '''
+        assert self.check == "DNA", "Introduced sequences must be DNA!"
+        code = get_code(table)
+        return SequenceBatch([code.translate(s) for s in self], check = "AMINO")
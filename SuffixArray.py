@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright 2022 by Group 7 (MSc Bioinformatics - University of Minho).  All rights reserved.
+
+"""
+This module provides the suffix array construction used by the :class:`BWT` index, without building the rotations of the sequence.
+The text is given as a bytes object of integer codes whose last symbol is a unique sentinel, smaller than every other symbol (code 0):
+	- The suffixes are first sorted by a prefix of up to 60 bits (several symbols packed in one integer)
+	- The groups of suffixes that still share the same rank are refined by prefix doubling, only inside each group
+Each round doubles the length of the sorted prefixes, so the number of rounds is logarithmic in the length of the longest repeat.
+The LCP array (longest common prefix of consecutive suffixes) is built from the suffix array in linear time (Kasai et al.).
+"""
+
+from array import array
+
+
+def suffix_array(text: bytes, sigma: int = None) -> array:
+	'''Construction of the suffix array of a text of integer codes ending in a unique sentinel (code 0)
+
+	Parameters
+	----------
+	text : bytes
+		Codes of the text, the last one being the sentinel
+	sigma : int, optional
+		Number of different codes, by default the biggest code plus one
+
+	Returns
+	-------
+	array
+		Initial positions of the ordered suffixes
+	'''
+	n = len(text)
+	if n == 0:
+		return array("q")
+	if sigma is None:
+		sigma = max(text) + 1
+	bits = max(1, (sigma - 1).bit_length())
+	q = min(n, max(1, 60 // bits))												# Nº de símbolos do prefixo inicial
+	mask = (1 << bits*q) - 1
+	keys = []
+	key = 0
+	for c in text[:q - 1]:
+		key = key << bits | c
+	for c in text[q - 1:]:
+		key = (key << bits | c) & mask
+		keys.append(key)
+	for _ in range(q - 1):															# Últimos sufixos completados com zeros (depois do sentinela)
+		key = (key << bits) & mask
+		keys.append(key)
+
+	sa = sorted(range(n), key = keys.__getitem__)
+	rank = [0]*n
+	groups = []																		# Grupos de sufixos com o mesmo prefixo (ainda por ordenar)
+	start, prev = 0, keys[sa[0]]
+	for j, i in enumerate(sa):
+		k = keys[i]
+		if k != prev:
+			if j - start > 1:
+				groups.append((start, j))
+			start, prev = j, k
+		rank[i] = start
+	if n - start > 1:
+		groups.append((start, n))
+	del keys
+
+	h = q
+	while groups:
+		refined = []
+		updates = []
+		for s, e in groups:
+			seg = sorted(sa[s:e], key = lambda i: rank[i + h])
+			sa[s:e] = seg
+			start, prev = s, rank[seg[0] + h]
+			for j in range(s + 1, e):
+				k = rank[seg[j - s] + h]
+				if k != prev:
+					if j - start > 1:
+						refined.append((start, j))
+					start, prev = j, k
+				updates.append((seg[j - s], start))
+			if e - start > 1:
+				refined.append((start, e))
+		for i, r in updates:													# Novas ordens só depois da ronda, para as chaves serem as da ronda anterior
+			rank[i] = r
+		groups = refined
+		h *= 2
+	return array("q", sa)
+
+
+def lcp_array(text, sa) -> array:
+	'''Construction of the LCP array by the algorithm of Kasai et al., in linear time: the suffixes are visited in the order of the text,
+	and the common prefix of each suffix with the previous one in the suffix array is at most one shorter than the one of the previous suffix
+
+	Parameters
+	----------
+	text : str or bytes
+		Text of the suffix array
+	sa : array
+		Suffix array of the text
+
+	Returns
+	-------
+	array
+		Length of the longest common prefix of each suffix with the previous one in the suffix array (0 for the first)
+	'''
+	n = len(sa)
+	rank = array("q", bytes(8*n))
+	for r, p in enumerate(sa):
+		rank[p] = r
+	lcp = array("q", bytes(8*n))
+	h = 0
+	for i in range(n):
+		r = rank[i]
+		if r == 0:
+			h = 0
+			continue
+		j = sa[r - 1]
+		while i + h < n and j + h < n and text[i + h] == text[j + h]:
+			h += 1
+		lcp[r] = h
+		if h:
+			h -= 1
+	return lcp
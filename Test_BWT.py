@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 # Copyright 2022 by Group 7 (MSc Bioinformatics - University of Minho).  All rights reserved.
 
+import os
+import tempfile
 import unittest
 from BWT import BWT
 
@@ -28,17 +30,114 @@ class TestBWT(unittest.TestCase):
         [('$GTAAAACACG', 3), ('AAAACACG$GT', 6), ('AAACACG$GTA', 7), ('AACACG$GTAA', 8), ('ACACG$GTAAA', 9), ('ACG$GTAAAAC', 0), ('CACG$GTAAAA', 10), ('CG$GTAAAACA', 1), ('G$GTAAAACAC', 2), 
 ('GTAAAACACG$', 4), ('TAAAACACG$G', 5)])
 
+    def test_fm_index(self):
+        self.assertEqual(self.t1.alphabet, "$ACGT")
+        self.assertEqual(self.t1.c_table, [0, 1, 6, 7, 10, 11])
+        self.assertEqual(self.t1.bwt, bytes([1, 3, 3, 3, 4, 2, 1, 1, 1, 1, 0]))
+        self.assertEqual([self.t1._rank(1, i) for i in (0, 1, 6, 7, 11)], [0, 1, 1, 2, 5])
+        t3 = BWT("TAGACAGAGA")
+        self.assertEqual(t3.bwt, self.t1.bwt)
+        self.assertEqual(t3.suffixarray(), self.t1.suffixarray())
+        self.assertRaises(ValueError, BWT, "AC$G$")
+
     def test_original_seq(self):
         self.assertEqual(self.t1.original_seq(),'TAGACAGAGA')
         self.assertEqual(self.t2.original_seq(),'GTAAAACACG')
+        seq = "ACGTTGCAAGGCTTAACCGGATATCG"*200
+        t = BWT(seq)
+        self.assertEqual(t.original_seq(), seq)
+        self.assertLess(t.nbytes, 2*len(seq))
+        self.assertNotIn("bwt_dic", vars(t))
 
     def test_find_pattern(self):
         self.assertEqual(self.t1.find_pattern("AGA"), [3, 4, 5])
         self.assertEqual(self.t2.find_pattern('GAG'), [])
+        self.assertEqual(self.t1.find_pattern("AXA"), [])
+
+    def test_count_locate(self):
+        self.assertEqual(self.t1.count("AGA"), 3)
+        self.assertEqual(self.t1.locate("AGA"), [1, 5, 7])
+        self.assertEqual(self.t1.locate("TAG"), [0])
+        self.assertEqual(self.t1.count("CC"), 0)
+        self.assertEqual(self.t1.locate("CC"), [])
+        self.assertEqual(self.t2.locate("AAA"), [6, 7])
+        self.assertEqual(self.t2.locate("CG"), [1])
+
+    def test_find_patterns(self):
+        pats = ["AGA", "GA", "CAGA", "TT", "A", "AXA"]
+        res = dict(self.t1.find_patterns(pats))
+        self.assertEqual(res, {i: self.t1.locate(p) for i, p in enumerate(pats)})
+        self.assertEqual(dict(self.t1.find_patterns([("q1", "AGA"), ("q2", "TAG")])), {"q1": [1, 5, 7], "q2": [0]})
+        self.assertEqual(dict(self.t1.find_patterns(pats, processes = 2, chunk_size = 2)), res)
+
+    def test_find_approximate(self):
+        self.assertEqual(self.t1.find_approximate("AGA", 0), [(1, 0), (5, 0), (7, 0)])
+        self.assertEqual(self.t1.find_approximate("ACA", 1), [(1, 1), (3, 0), (5, 1), (7, 1)])
+        self.assertEqual(self.t1.find_approximate("TGA", 1), [(1, 1), (5, 1), (7, 1)])
+        self.assertEqual(self.t1.find_approximate("TGAC", 1, "edit"), [(0, 1), (1, 1), (2, 1)])
+        self.assertEqual(self.t1.find_approximate("GACGA", 1, "edit"), [(2, 1), (6, 1)])
+        self.assertRaises(ValueError, self.t1.find_approximate, "AGA", 1, "levenshtein")
+
+    def test_smems(self):
+        self.assertEqual(self.t1.smems("CAGAGT", 1), [(0, 5, [4]), (5, 6, [0])])
+        self.assertEqual(self.t1.smems("CAGAGT", 2), [(0, 5, [4])])
+        self.assertEqual(self.t1.smems("TAGAXAGA", 3), [(0, 4, [0]), (5, 8, [1, 5, 7])])
+        self.assertEqual(self.t1.smems("GACAT", 1), [(0, 4, [2]), (4, 5, [0])])
+        self.assertEqual(self.t1.smems("XXX", 1), [])
+        self.assertEqual(BWT("TAGACAGAGA", rank = "wavelet").smems("CAGAGT", 1), self.t1.smems("CAGAGT", 1))
+
+    def test_runlength(self):
+        t = BWT("TAGACAGAGA$", rank = "runlength")
+        self.assertEqual(t.bwt, self.t1.bwt)
+        self.assertEqual(t.bwt_dic, self.t1.bwt_dic)
+        self.assertEqual(t.find_pattern("AGA"), [3, 4, 5])
+        self.assertEqual(t.locate("AGA"), [1, 5, 7])
+        self.assertEqual(t.original_seq(), 'TAGACAGAGA')
+        self.assertRaises(ValueError, BWT, "ACGT", rank = "bits")
+
+    def test_wavelet(self):
+        prot = "MKTAYIAKQRQISFVKSHFSRQ_MKTAY"
+        t = BWT(prot, rank = "wavelet")
+        self.assertEqual(t.bwt, BWT(prot).bwt)
+        self.assertEqual(t.locate("MKTAY"), [0, 23])
+        self.assertEqual(t.count("SRQ"), 1)
+        self.assertEqual(t.original_seq(), prot)
+
+    def test_repeats(self):
+        self.assertEqual(self.t1.lcp(), (0, 0, 1, 1, 3, 3, 0, 0, 2, 2, 0))
+        self.assertEqual(self.t1.longest_repeat(), ("AGA", [1, 5, 7]))
+        self.assertEqual(self.t1.maximal_repeats(), {"AGA": [1, 5, 7]})
+        self.assertEqual(self.t1.maximal_repeats(1), {"AGA": [1, 5, 7], "A": [1, 3, 5, 7, 9]})
+        self.assertEqual(self.t1.distinct_substrings(), 43)
+        self.assertEqual(BWT("ACGT").longest_repeat(), ("", []))
+        self.assertEqual(BWT("ACGT").distinct_substrings(), 10)
+
+    def test_sa_sample(self):
+        for rate in (1, 3, 100):
+            t = BWT("TAGACAGAGA$", sa_sample = rate)
+            self.assertEqual(t.suffixarray(), self.t1.suffixarray())
+            self.assertEqual(t.locate("AGA"), [1, 5, 7])
+        self.assertEqual(len(BWT("TAGACAGAGA$", sa_sample = 3)._sa_rows), 4)
+        self.assertRaises(ValueError, BWT, "ACGT", sa_sample = 0)
 
     def test_suffixarray(self):
         self.assertEqual(self.t1.suffixarray(),(10, 9, 3, 7, 1, 5, 4, 8, 2, 6, 0))
         self.assertEqual(self.t2.suffixarray(),(3, 6, 7, 8, 9, 0, 10, 1, 2, 4, 5))
 
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "t2.idx")
+            self.t2.save(path)
+            with BWT.load(path) as t:
+                self.assertEqual(t.bwt_dic, self.t2.bwt_dic)
+                self.assertEqual(t.suffixarray(), self.t2.suffixarray())
+                self.assertEqual(t.find_pattern("AAA"), self.t2.find_pattern("AAA"))
+                self.assertEqual(t.locate("AC"), [0, 9])
+                self.assertEqual(t.original_seq(), 'GTAAAACACG')
+                self.assertEqual(t.seq, 'ACG$GTAAAAC')
+            with open(path, "wb") as handle:
+                handle.write(b"ACGT")
+            self.assertRaises(ValueError, BWT.load, path)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
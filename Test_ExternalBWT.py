@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 by Group 7 (MSc Bioinformatics - University of Minho).  All rights reserved.
+
+import gzip
+import os
+import tempfile
+import unittest
+from BWT import BWT
+from ExternalBWT import build_index
+
+class TestExternalBWT(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.seq = "TAGACAGAGA"*20 + "A"*50 + "CCGT"*30
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def build(self, text, **kwargs):
+        source = os.path.join(self.dir.name, "seq.fa")
+        with open(source, "w") as handle:
+            handle.write(text)
+        return build_index(source, os.path.join(self.dir.name, "seq.idx"), **kwargs)
+
+    def test_same_index(self):
+        fasta = ">seq1 test\n" + "\n".join(self.seq[i:i + 60] for i in range(0, len(self.seq), 60)) + "\n"
+        for memory in (128, 1024, 1 << 20):                             # Buckets ordenados por partes e juntos (merge) ou de uma só vez
+            with self.subTest(memory = memory):
+                ref = BWT(self.seq, sa_sample = 4)
+                with self.build(fasta, memory = memory, sa_sample = 4) as t:
+                    self.assertEqual(bytes(t.bwt), bytes(ref.bwt))
+                    self.assertEqual((t.alphabet, t.c_table), (ref.alphabet, ref.c_table))
+                    self.assertEqual(list(t._sa_rows), list(ref._sa_rows))
+                    self.assertEqual(t.locate("AGAG"), ref.locate("AGAG"))
+                    self.assertEqual(t.seq, self.seq)
+
+    def test_progress(self):
+        events = []
+        with self.build("ACGTTGCA", memory = 256, progress = lambda *args: events.append(args)) as t:
+            self.assertEqual(t.locate("GCA"), [5])
+        self.assertEqual(list(dict.fromkeys(e[0] for e in events)), ["read", "distribute", "sort", "occ"])
+        self.assertEqual(events[-1][1:3], (9, 9))
+        self.assertTrue(events[-1][3] is None or events[-1][3] > 0)
+
+    def test_gzip(self):
+        source = os.path.join(self.dir.name, "seq.fa.gz")
+        with gzip.open(source, "wt") as handle:
+            handle.write(">seq\n" + self.seq + "\n")
+        events = []
+        with build_index(source, os.path.join(self.dir.name, "seq.idx"), progress = lambda *args: events.append(args)) as t:
+            self.assertEqual(t.seq, self.seq)
+        reads = [e for e in events if e[0] == "read"]
+        self.assertEqual(reads[-1][1:3], (len(self.seq) + 6, None))
+
+    def test_soft_masked(self):
+        with self.build(">seq\nACGTacgt\nAC\n") as t:                         # Regiões repetidas em minúsculas
+            self.assertEqual(t.alphabet, "$ACGT")
+            self.assertEqual(t.count("GTAC"), 2)
+
+    def test_errors(self):
+        self.assertRaises(ValueError, self.build, ">a\nACGT\n>b\nACGT\n")
+        self.assertRaises(ValueError, self.build, "AC$GT")
+        self.assertRaises(ValueError, self.build, "ACGT", memory = 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 by Group 7 (MSc Bioinformatics - University of Minho).  All rights reserved.
+
+import unittest
+from GeneticCode import GeneticCode, get_code
+
+class TestGeneticCode(unittest.TestCase):
+    def setUp(self):
+        self.t1 = get_code(1)
+        self.t2 = get_code(2)
+
+    def test_tables(self):
+        self.assertEqual(len(self.t1.codons), 64)
+        self.assertEqual(self.t1.codons["ATG"], "M")
+        self.assertEqual(sorted(self.t1.stops()), ["TAA", "TAG", "TGA"])
+        self.assertEqual(sorted(self.t2.stops()), ["AGA", "AGG", "TAA", "TAG"])
+        self.assertEqual(self.t2.codons["TGA"], "W")
+        self.assertIs(get_code(1), self.t1)
+        self.assertRaises(ValueError, GeneticCode, 7)
+
+    def test_translate(self):
+        self.assertEqual(self.t1.translate("ATGTGATAAGG"), "M__")
+        self.assertEqual(self.t1.translate("ATGTGATAAGG", 1), "CDK")
+        self.assertEqual(self.t2.translate("ATGTGATAAGG"), "MW_")
+        self.assertEqual(self.t1.translate("ATG-GGTGA"), "M_")
+
+    def test_translate_codes(self):
+        self.assertEqual(self.t1.translate_codes([14, 56, 48]), "M__")
+
+if __name__ == '__main__':
+    unittest.main()
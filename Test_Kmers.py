@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 by Group 7 (MSc Bioinformatics - University of Minho).  All rights reserved.
+
+import unittest
+from Kmers import decode_kmer, iter_kmers, kmer_counts
+from Sequence import Sequence
+
+class TestKmers(unittest.TestCase):
+    def setUp(self):
+        self.t1 = Sequence("ACGTTGCA")
+        self.t2 = Sequence("ACG-ACGU")
+
+    def test_iter_kmers(self):
+        self.assertEqual(list(self.t1.iter_kmers(3)), [6, 27, 47, 62, 57, 36])
+        self.assertEqual([decode_kmer(c, 3) for c in self.t1.iter_kmers(3)], ["ACG", "CGT", "GTT", "TTG", "TGC", "GCA"])
+        self.assertEqual([decode_kmer(c, 3) for c in self.t2.iter_kmers(3)], ["ACG", "ACG", "CGT"])
+        self.assertEqual([decode_kmer(c, 3) for c in self.t1.iter_kmers(3, canonical = True)], ["ACG", "ACG", "AAC", "CAA", "GCA", "GCA"])
+        self.assertRaises(ValueError, list, iter_kmers("ACGT", 32))
+
+    def test_kmer_counts(self):
+        self.assertEqual(self.t2.kmer_counts(3, decode = True), {"ACG": 2, "CGU": 1})
+        self.assertEqual(Sequence("ACGUUG").kmer_counts(3, decode = True), {"ACG": 1, "CGU": 1, "GUU": 1, "UUG": 1})
+        self.assertEqual(kmer_counts("ACGTTGCA", 2, canonical = True), {1: 2, 6: 1, 0: 1, 4: 2, 9: 1})
+        self.assertEqual(self.t1.kmer_counts(8), {0b0001101111100100: 1})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 by Group 7 (MSc Bioinformatics - University of Minho).  All rights reserved.
+
+import os
+import pickle
+import tempfile
+import unittest
+from MappedSequence import MappedSequence
+from Sequence import Sequence
+
+class TestMappedSequence(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.s1 = "ATGAAATTTGGGTAACCCATGTTTTAGCATG"
+        self.fasta = os.path.join(self.dir.name, "genome.fa")
+        self.flat = os.path.join(self.dir.name, "genome.txt")
+        with open(self.fasta, "w") as f:
+            f.write(">chr1 test\n" + "\n".join(self.s1[i:i+8].lower() for i in range(0, len(self.s1), 8)) + "\n")
+        with open(self.flat, "w") as f:
+            f.write(self.s1 + "\n")
+        self.t1 = Sequence.from_file(self.fasta)
+        self.t2 = MappedSequence(self.flat)
+
+    def tearDown(self):
+        self.t1.close()
+        self.t2.close()
+        self.dir.cleanup()
+
+    def test_layout(self):
+        self.assertEqual(len(self.t1), 31)
+        self.assertEqual(self.t1.id, "chr1")
+        self.assertEqual(self.t1.check, "DNA")
+        self.assertEqual(self.t1.seq, self.s1)
+        with open(self.flat, "w") as f:
+            f.write("ACGT\nAC\nACGT\n")
+        self.assertRaises(ValueError, MappedSequence, self.flat)
+
+    def test_slices(self):
+        self.assertEqual(self.t1.get_slice(5, 20), self.s1[5:20])
+        self.assertEqual(self.t1.get_slice(-4, None), self.s1[-4:])
+        self.assertEqual(bytes(self.t2.view(3, 9)), self.s1[3:9].encode())
+        self.assertRaises(ValueError, self.t1.view, 6, 10)
+
+    def test_methods(self):
+        seq = Sequence(self.s1)
+        self.assertEqual(self.t1.percentage(), seq.percentage())
+        self.assertEqual(self.t1.percentage(4, 12), Sequence(self.s1[4:12]).percentage())
+        self.assertEqual(self.t1.comp_inverse(), seq.comp_inverse())
+        self.assertEqual(self.t2.comp_inverse(2, 11), Sequence(self.s1[2:11]).comp_inverse())
+        self.assertEqual(self.t1.get_codons(), seq.get_codons())
+        self.assertEqual(self.t1.translation(), seq.translation())
+
+    def test_pickle(self):
+        t = pickle.loads(pickle.dumps(self.t1))
+        self.assertEqual(t.get_slice(0, 10), self.s1[:10])
+        t.close()
+
+if __name__ == '__main__':
+    unittest.main()
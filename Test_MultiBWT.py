@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 by Group 7 (MSc Bioinformatics - University of Minho).  All rights reserved.
+
+import os
+import tempfile
+import unittest
+from MultiBWT import MultiBWT
+from Sequence import Sequence
+
+class TestMultiBWT(unittest.TestCase):
+    def setUp(self):
+        self.t1 = MultiBWT(["TAGACA", "GAGA", "ACAGT"])
+        self.t2 = MultiBWT([Sequence("ACGT", id = "s1"), ("s2", "GGACG")])
+
+    def test_locate(self):
+        self.assertEqual(self.t1.locate("AGA"), [(0, 1), (1, 1)])
+        self.assertEqual(self.t1.locate("ACA"), [(0, 3), (2, 0)])
+        self.assertEqual(self.t1.count("GA"), 3)
+        self.assertEqual(self.t1.count("AG"), 3)
+        self.assertEqual(self.t1.locate("ACAG"), [(2, 0)])
+        self.assertEqual(self.t1.locate("CAGA"), [])                   # CA#GAGA
+        self.assertEqual(self.t1.count("A#G"), 0)
+        self.assertEqual(self.t2.locate("ACG"), [("s1", 0), ("s2", 2)])
+        self.assertEqual(dict(self.t2.find_patterns(["CG", "GG"])), {0: [("s1", 1), ("s2", 3)], 1: [("s2", 0)]})
+        pats = ["AGA", "CAGA", "ACA", "GT"]
+        self.assertEqual(dict(self.t1.find_patterns(pats, processes = 2)), dict(self.t1.find_patterns(pats)))
+        self.assertEqual(dict(self.t1.find_patterns(pats, processes = 2))[1], [])
+        self.assertEqual(self.t1.find_approximate("AGT", 1), [((0, 1), 1), ((1, 1), 1), ((2, 2), 0)])
+        self.assertEqual(self.t1.smems("AGACAGT", 3), [(0, 5, [(0, 1)]), (2, 7, [(2, 0)])])
+
+    def test_sequences(self):
+        self.assertEqual([self.t1.sequence(i) for i in range(3)], ["TAGACA", "GAGA", "ACAGT"])
+        self.assertEqual(self.t2.ids, ["s1", "s2"])
+        self.assertRaises(ValueError, MultiBWT, ["AC#GT"])
+        self.assertRaises(ValueError, MultiBWT, [])
+
+    def test_repeats(self):
+        t = MultiBWT(["ACGTA", "ACGTA", "CC"])
+        self.assertEqual(t.longest_repeat(), ("ACGTA", [(0, 0), (1, 0)]))          # Sem o separador
+        self.assertEqual(t.maximal_repeats(), {"ACGTA": [(0, 0), (1, 0)]})
+        self.assertEqual(t.distinct_substrings(), 14 + 1)                          # ACGTA e CC (C já contado)
+        self.assertEqual(MultiBWT(["G", "AC", "AC"]).maximal_repeats(1), {"AC": [(1, 0), (2, 0)]})
+        self.assertEqual(MultiBWT(["ACGT"]).distinct_substrings(), 10)
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "multi.idx")
+            self.t2.save(path)
+            with MultiBWT.load(path) as t:
+                self.assertEqual(t.locate("ACG"), [("s1", 0), ("s2", 2)])
+                self.assertEqual(t.sequence(1), "GGACG")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 by Group 7 (MSc Bioinformatics - University of Minho).  All rights reserved.
+
+import unittest
+from PackedSequence import PackedSequence
+from Sequence import Sequence
+
+class TestPackedSequence(unittest.TestCase):
+    def setUp(self):
+        self.s1 = "ATGAAATTTGGGTAACCCATGTTTTAGCATG"
+        self.t1 = PackedSequence(self.s1)
+        self.t2 = PackedSequence(Sequence("acgtac"))
+
+    def test_pack(self):
+        self.assertEqual(len(self.t1), 31)
+        self.assertEqual(len(self.t1.data), 8)
+        self.assertEqual(self.t1.unpack(), self.s1)
+        self.assertEqual(str(self.t2), "DNA:ACGTAC")
+        self.assertEqual(self.t2.data, bytearray([0b00011011, 0b00010000]))
+        self.assertRaises(TypeError, PackedSequence, "ACGN")
+
+    def test_slice(self):
+        self.assertEqual(self.t1.get_slice(5, 14), self.s1[5:14])
+        self.assertEqual(self.t1[3:11], PackedSequence(self.s1[3:11]))
+        self.assertEqual(self.t1[-3], "A")
+
+    def test_comp_inverse(self):
+        self.assertEqual(self.t1.comp_inverse().unpack(), Sequence(self.s1).comp_inverse())
+        self.assertEqual(self.t2.comp_inverse().unpack(), "GTACGT")
+
+    def test_counts(self):
+        self.assertEqual(self.t2.counts(), {'A': 2, 'C': 2, 'G': 1, 'T': 1})
+        self.assertEqual(self.t1.percentage(), Sequence(self.s1).percentage())
+
+    def test_transcription(self):
+        self.assertEqual(self.t2.transcription(), "ACGUAC")
+
+    def test_codons(self):
+        self.assertEqual(self.t2.codon_codes(), [6, 49])
+        self.assertEqual(self.t2.get_codons(1), ["CGT"])
+        self.assertEqual(self.t1.translation(), Sequence(self.s1).translation())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 by Group 7 (MSc Bioinformatics - University of Minho).  All rights reserved.
+
+import unittest
+from Sequence import Sequence
+import ParallelTranslation
+
+class TestParallelTranslation(unittest.TestCase):
+    def setUp(self):
+        self.t1 = Sequence("ATGAAACCCGGGTAAATGTTTTGAATGCCCAAATAGCCATGGGG")
+        self.t2 = Sequence("CCATG" + "GCA"*40 + "TAA" + "ATG" + "CCC"*30)
+
+    def test_translate(self):
+        for size in (3, 6, 10, 1000):
+            self.assertEqual(ParallelTranslation.translate(self.t1.seq, processes = 2, chunk_size = size), self.t1.translation())
+        self.assertEqual(self.t2.translation(processes = 2, chunk_size = 9), self.t2.translation())
+
+    def test_all_prots(self):
+        for t in (self.t1, self.t2):
+            for size in (3, 6, 12, 21, 1000):
+                self.assertEqual(t.get_all_prots(processes = 2, chunk_size = size), t.get_all_prots())
+                self.assertEqual(t.get_bigger_prot(processes = 2, chunk_size = size), t.get_bigger_prot())
+
+if __name__ == '__main__':
+    unittest.main()
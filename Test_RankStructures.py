@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 by Group 7 (MSc Bioinformatics - University of Minho).  All rights reserved.
+
+import unittest
+from RankStructures import OccRank, RunLengthRank, WaveletRank
+
+class TestRankStructures(unittest.TestCase):
+    def setUp(self):
+        self.bwt = bytes([1, 3, 3, 3, 4, 2, 1, 1, 1, 1, 0])                # BWT de TAGACAGAGA$
+        self.ranks = [OccRank(self.bwt, 5, step = 4), RunLengthRank(self.bwt, 5), WaveletRank(self.bwt, 5)]
+
+    def test_rank(self):
+        for r in self.ranks:
+            for c in range(5):
+                self.assertEqual([r.rank(c, i) for i in range(12)], [self.bwt[:i].count(c) for i in range(12)])
+            self.assertEqual([r[i] for i in range(11)], list(self.bwt))
+            self.assertEqual(r.tobytes(), self.bwt)
+
+    def test_packed(self):
+        occ = self.ranks[0]
+        self.assertTrue(occ.packed)
+        self.assertEqual((len(occ.bwt), occ.dollar), (3, 10))                          # 11 linhas em 3 bytes, "$" à parte
+        self.assertFalse(OccRank(self.bwt, 5, step = 6).packed)
+        bwt = bytes([1, 5, 0, 2, 5, 0])                                             # Mais de 4 códigos e vários códigos 0 (MultiBWT)
+        occ = OccRank(bwt, 6, step = 4)
+        self.assertFalse(occ.packed)
+        self.assertEqual([occ.rank(5, i) for i in range(7)], [0, 0, 1, 1, 1, 2, 2])
+
+    def test_runs(self):
+        rl = self.ranks[1]
+        self.assertEqual(rl.heads, bytes([1, 3, 4, 2, 1, 0]))
+        self.assertEqual(list(rl.starts), [0, 1, 4, 5, 6, 10])
+        self.assertEqual([rl.select(1, k) for k in range(5)], [0, 6, 7, 8, 9])
+        self.assertEqual(rl.select(3, 2), 3)
+        self.assertRaises(IndexError, rl.select, 4, 1)
+
+    def test_wavelet(self):
+        wt = self.ranks[2]
+        self.assertEqual(wt.levels, 3)
+        self.assertEqual(wt.zeros, [10, 7, 3])
+        bwt = bytes(range(22))*40
+        wt = WaveletRank(bwt, 22)
+        self.assertEqual(wt.levels, 5)
+        self.assertEqual([wt.rank(c, 700) for c in (0, 7, 21)], [bwt[:700].count(c) for c in (0, 7, 21)])
+        self.assertLess(wt.nbytes, len(bwt))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 by Group 7 (MSc Bioinformatics - University of Minho).  All rights reserved.
+
+import os
+import random
+import tempfile
+import unittest
+from BWT import BWT
+from MultiBWT import MultiBWT
+from ReadAligner import ReadAligner
+from Sequence import Sequence
+
+class TestReadAligner(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(7)
+        self.ref = "".join(rng.choice("ACGT") for _ in range(5000))
+        self.index = BWT(self.ref)
+        self.local = ReadAligner(self.index, min_seed = 15)
+        self.glob = ReadAligner(self.index, min_seed = 15, mode = "global")
+
+    def test_exact(self):
+        res = self.local.align(self.ref[1000:1060], "r1")
+        self.assertEqual((res.read_id, res.position, res.strand, res.score, res.cigar), ("r1", 1000, "+", 60, "60M"))
+        res = self.local.align(Sequence(self.ref[2000:2060], id = "r2"))
+        self.assertEqual((res.read_id, res.position), ("r2", 2000))
+        self.assertEqual(self.local.align(self.ref[2500:2570].lower())[1:5], (2500, "+", 70, "70M"))
+
+    def test_differences(self):
+        read = self.ref[1000:1030] + "A" + self.ref[1030:1060]                                       # Inserção no read
+        res = self.glob.align(read)
+        self.assertEqual((res.position, res.cigar, res.score), (1000, "30M1I30M", 60 - 6))
+        read = self.ref[1000:1030] + self.ref[1032:1062]                                             # Deleção no read
+        self.assertEqual(self.glob.align(read)[1:5], (1000, "+", 60 - 12, "30M2D30M"))
+        read = "GGGGGGGGGG" + self.ref[3000:3050]                                                     # Início que não alinha (soft clip)
+        res = self.local.align(read)
+        self.assertEqual((res.position, res.cigar, res.read_start, res.read_end), (3000, "10S50M", 10, 60))
+
+    def test_reverse_strand(self):
+        read = Sequence(self.ref[4000:4080]).comp_inverse()
+        res = self.local.align(read)
+        self.assertEqual((res.position, res.strand, res.cigar), (4000, "-", "80M"))
+        self.assertIsNone(ReadAligner(self.index, min_seed = 15, both_strands = False).align(read).position)
+
+    def test_unaligned(self):
+        res = self.local.align("ACGTACGTAC")
+        self.assertEqual((res.position, res.score, res.cigar), (None, 0, ""))
+        self.assertRaises(ValueError, ReadAligner, self.index, mode = "semi")
+
+    def test_multi(self):
+        aligner = ReadAligner(MultiBWT([self.ref[:2500], self.ref[2500:]]), min_seed = 15)
+        self.assertEqual(aligner.align(self.ref[3000:3060]).position, (1, 500))
+        res = aligner.align(self.ref[2460:2540])                                                    # Read sobre a fronteira das duas sequências
+        self.assertEqual((res.position, res.cigar), ((0, 2460), "40M40S"))
+        self.assertIsNone(ReadAligner(aligner.index, min_seed = 15, mode = "global").align(self.ref[2460:2540]).position)
+
+    def test_align_file(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "reads.fa")
+            with open(path, "w") as handle:
+                for k in range(20):
+                    handle.write(f">r{k}\n{self.ref[200*k:200*k + 70]}\n")
+            serial = list(self.local.align_file(path))
+            self.assertEqual([(a.read_id, a.position) for a in serial], [(f"r{k}", 200*k) for k in range(20)])
+            self.assertEqual(list(self.local.align_file(path, processes = 2, chunk_size = 3)), serial)
+
+if __name__ == '__main__':
+    unittest.main()
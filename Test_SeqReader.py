@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 by Group 7 (MSc Bioinformatics - University of Minho).  All rights reserved.
+
+import gzip
+import os
+import tempfile
+import unittest
+from SeqReader import read_fasta, read_fastq, read_sequences
+
+class TestSeqReader(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.fasta = os.path.join(self.dir.name, "seqs.fa")
+        self.fastq = os.path.join(self.dir.name, "reads.fq.gz")
+        with open(self.fasta, "w") as f:
+            f.write(">seq1 first sequence\nATGAAA\nttt\n\n>seq2\nMKF_\n")
+        with gzip.open(self.fastq, "wt") as f:
+            f.write("@read1\nACGT\n+\nIIII\n@read2 desc\nGGA\n+read2\n#!I\n")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_read_fasta(self):
+        recs = list(read_fasta(self.fasta, chunk_size = 4))
+        self.assertEqual([(r.id, r.seq, r.check) for r in recs], [("seq1", "ATGAAATTT", "DNA"), ("seq2", "MKF_", "AMINO")])
+        self.assertIsNone(recs[0].qualities)
+
+    def test_read_fastq(self):
+        recs = list(read_fastq(self.fastq, chunk_size = 5))
+        self.assertEqual([(r.id, r.seq, r.qualities) for r in recs], [("read1", "ACGT", "IIII"), ("read2", "GGA", "#!I")])
+
+    def test_read_sequences(self):
+        self.assertEqual([r.id for r in read_sequences(self.fasta)], ["seq1", "seq2"])
+        self.assertEqual([r.id for r in read_sequences(self.fastq)], ["read1", "read2"])
+        with open(self.fasta, "w") as f:
+            f.write("@read1\nACGT\n+\nIII\n")
+        self.assertRaises(ValueError, list, read_fastq(self.fasta))
+
+if __name__ == '__main__':
+    unittest.main()
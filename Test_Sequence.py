@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 by Group 7 (MSc Bioinformatics - University of Minho).  All rights reserved.
+
+import unittest
+from Sequence import Sequence, classify, validate_many
+
+class TestSequence(unittest.TestCase):
+    def setUp(self):
+        self.t1 = Sequence("ATGAAATTTGGGTAACCCATGTTTTAGCATG")
+        self.t2 = Sequence("MKFG_PMF_")
+
+    def test_classify(self):
+        self.assertEqual(self.t1.check, "DNA")
+        self.assertEqual(self.t2.check, "AMINO")
+        self.assertEqual(classify(b"acgu-"), "RNA")
+        self.assertEqual(validate_many(["ACG", "ACU", "MKL_", b"TT"]), ["DNA", "RNA", "AMINO", "DNA"])
+        self.assertRaises(TypeError, Sequence, "ACGTX")
+        self.assertRaises(TypeError, validate_many, ["ACG", "ACGÇ"])
+        self.assertEqual(Sequence("MKL", check = "AMINO").check, "AMINO")
+        self.assertRaises(TypeError, Sequence, "ACG", check = "PROTEIN")
+
+    def test_translation(self):
+        self.assertEqual(self.t1.translation(), "MKFG_PMF_H")
+        self.assertEqual(self.t1.translation(table = 2), "MKFG_PMF_H")
+        self.assertEqual(Sequence("ATGTGA").translation(table = 2), "MW")
+
+    def test_get_aa_orfs(self):
+        self.assertEqual(self.t1.get_aa_orfs(),
+        {'ORF +1': 'MKFG_PMF_H', 'ORF +2': '_NLGNPCFSM', 'ORF +3': 'EIWVTHVLA', 'ORF -1': 'HAKTWVTQIS', 'ORF -2': 'MLKHGLPKFH', 'ORF -3': 'C_NMGYPNF'})
+
+    def test_get_all_prots_orfs(self):
+        self.assertEqual(self.t1.get_all_prots_orfs(),
+        {'ORF +1': ['MKFG_', 'MF_'], 'ORF +2': [], 'ORF +3': [], 'ORF -1': [], 'ORF -2': [], 'ORF -3': []})
+
+    def test_iter_orfs(self):
+        self.assertEqual(list(self.t1.iter_orfs()), [(1, 0, 15, 'MKFG_'), (1, 18, 27, 'MF_')])
+        self.assertEqual(list(self.t1.iter_orfs(min_length = 4)), [(1, 0, 15, 'MKFG_')])
+        self.assertEqual(list(Sequence("ATGATGTAA").iter_orfs(nested = True)), [(1, 0, 9, 'MM_'), (1, 3, 9, 'M_')])
+        self.assertEqual(list(Sequence("TTACATCAT").iter_orfs(proteins = False)), [(-1, 0, 9, None)])
+
+    def test_get_all_prots(self):
+        self.assertEqual(self.t1.get_all_prots(), ['MKFG_', 'MF_'])
+        self.assertEqual(self.t2.get_all_prots(), ['MKFG_', 'MF_'])
+        self.assertEqual(self.t1.get_bigger_prot(), 'MKFG_')
+        self.assertEqual(Sequence('ATG------AAATAAATGAAACCCTAA').get_bigger_prot(), 'MKP_')        # Maior proteína, não a ORF mais longa (gaps)
+
+    def test_cache(self):
+        self.assertIsNone(self.t1.cache_info())
+        self.t1.enable_cache()
+        orfs = self.t1.get_all_prots_orfs()
+        orfs["ORF +1"].append("X")
+        self.assertEqual(self.t1.get_all_prots_orfs()["ORF +1"], ['MKFG_', 'MF_'])
+        info = self.t1.cache_info()
+        self.assertEqual((info["hits"], info["size"]), (1, 39))
+        self.assertIn(("get_all_prots_orfs", ()), info["entries"])
+        self.assertIn(("comp_inverse", ()), info["entries"])
+        self.t1.seq = "ATGCCCTAA"
+        self.assertEqual(self.t1.get_bigger_prot(), "MP_")
+        self.assertEqual(self.t1.cache_info()["entries"], [("get_bigger_prot", ())])
+        self.t1.clear_cache()
+        self.assertEqual(self.t1.cache_info()["size"], 0)
+        self.t1.enable_cache(maxsize = 10)
+        self.t1.translation()
+        self.t1.comp_inverse()
+        self.assertEqual(self.t1.cache_info()["entries"], [("comp_inverse", ())])
+        self.t1.enable_cache()
+        self.t1.translation()
+        self.t1.translation(1)
+        self.t1.translation(table = 1, processes = 2)
+        self.assertEqual(self.t1.cache_info()["hits"], 2)                            # Mesma chave com os argumentos por omissão ou em paralelo
+        self.assertEqual(self.t1.cache_info()["entries"], [("translation", (("table", 1),))])
+
+if __name__ == '__main__':
+    unittest.main()
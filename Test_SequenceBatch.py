@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 by Group 7 (MSc Bioinformatics - University of Minho).  All rights reserved.
+
+import unittest
+from array import array
+from Sequence import Sequence
+from SequenceBatch import SequenceBatch
+
+class TestSequenceBatch(unittest.TestCase):
+    def setUp(self):
+        self.seqs = ["ATGAAATTT", "ccgta", "", "TTTAGCATG"]
+        self.t1 = SequenceBatch(self.seqs)
+
+    def test_build(self):
+        self.assertEqual(len(self.t1), 4)
+        self.assertEqual(self.t1.buffer, b"ATGAAATTTCCGTATTTAGCATG")
+        self.assertEqual(list(self.t1.offsets), [0, 9, 14, 14, 23])
+        self.assertEqual(self.t1[1], "CCGTA")
+        self.assertEqual(self.t1.sequence(-1).seq, "TTTAGCATG")
+        self.assertRaises(TypeError, SequenceBatch, ["ACGT", "ACGX"])
+        self.assertRaises(TypeError, SequenceBatch, ["ACGU", "MKVLA"])                 # RNA e proteína
+        self.assertRaisesRegex(TypeError, "Sequence 1 is RNA", SequenceBatch, ["ACGT", "ACGU"])
+        self.assertRaisesRegex(TypeError, "sequence 1", SequenceBatch, ["ACGT", "ACGX"])
+        self.assertEqual(SequenceBatch(["MKVLA", "WQE"]).check, "AMINO")
+        self.assertEqual(SequenceBatch(["ACGU", "AAC", ""]).check, "RNA")               # Sequências ambíguas (sem "U" ou só com ACGT)
+        self.assertEqual(SequenceBatch(["MKV", "ACG"]).check, "AMINO")
+        self.assertEqual(SequenceBatch(["ACG", "MKV"]).check, "AMINO")
+
+    def test_composition(self):
+        self.assertEqual(self.t1.composition()["T"], array("q", [4, 1, 0, 4]))
+        self.assertEqual(self.t1.percentage()["A"][0], Sequence("ATGAAATTT").percentage()["A"])
+
+    def test_transforms(self):
+        self.assertEqual(self.t1.transcription().to_list(), [Sequence(s).transcription() if s else "" for s in self.seqs])
+        self.assertEqual(self.t1.comp_inverse().to_list(), [Sequence(s).comp_inverse() if s else "" for s in self.seqs])
+        self.assertEqual(self.t1.translation().to_list(), ["MKF", "P", "", "FSM"])
+
+if __name__ == '__main__':
+    unittest.main()
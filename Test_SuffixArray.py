@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 by Group 7 (MSc Bioinformatics - University of Minho).  All rights reserved.
+
+import unittest
+from SuffixArray import lcp_array, suffix_array
+
+class TestSuffixArray(unittest.TestCase):
+    def setUp(self):
+        self.t1 = bytes([4, 1, 3, 1, 2, 1, 3, 1, 3, 1, 0])                 # TAGACAGAGA$
+        self.t2 = bytes([1])*300 + bytes([0])
+
+    def test_suffix_array(self):
+        self.assertEqual(list(suffix_array(self.t1)), [10, 9, 3, 7, 1, 5, 4, 8, 2, 6, 0])
+        self.assertEqual(list(suffix_array(self.t2)), list(range(300, -1, -1)))
+        self.assertEqual(list(suffix_array(bytes([0]))), [0])
+        self.assertEqual(list(suffix_array(b"")), [])
+
+    def test_lcp_array(self):
+        self.assertEqual(list(lcp_array(self.t1, suffix_array(self.t1))), [0, 0, 1, 1, 3, 3, 0, 0, 2, 2, 0])
+        self.assertEqual(list(lcp_array(self.t2, suffix_array(self.t2))), [0] + list(range(300)))
+        self.assertEqual(list(lcp_array("banana$", [6, 5, 3, 1, 0, 4, 2])), [0, 0, 1, 3, 0, 0, 2])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 by Group 7 (MSc Bioinformatics - University of Minho).  All rights reserved.
+
+import unittest
+from Sequence import Sequence
+from WindowStats import sliding_windows
+
+class TestWindowStats(unittest.TestCase):
+    def setUp(self):
+        self.t1 = Sequence("ATGGGCCATTAA")
+
+    def test_windows(self):
+        res = list(self.t1.window_stats(6, 3))
+        self.assertEqual([(w.start, w.end) for w in res], [(0, 6), (3, 9), (6, 12)])
+        self.assertEqual(res[0].counts, {"A": 1, "T": 1, "G": 3, "C": 1})
+        self.assertEqual(res[0].percentages, Sequence("ATGGGC").percentage())
+        self.assertAlmostEqual(res[1].gc, 4/6)
+        self.assertEqual(res[1].gc_skew, 0.0)
+        self.assertEqual(res[0].gc_skew, 0.5)
+        self.assertIsNone(res[0].codons)
+
+    def test_codons(self):
+        res = list(sliding_windows(["atggg", "ccat", "taa"], 7, 2, codons = True))
+        self.assertEqual([w.start for w in res], [0, 2, 4])
+        self.assertEqual(res[0].codons, {"ATG": 1, "GGC": 1})
+        self.assertEqual(res[1].codons, {"GGC": 1, "CAT": 1})
+        self.assertEqual(res[2].codons, {"CAT": 1})
+        self.assertRaises(ValueError, list, sliding_windows("ACGT", 2, codons = True))
+
+if __name__ == '__main__':
+    unittest.main()
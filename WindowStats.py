@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright 2022 by Group 7 (MSc Bioinformatics - University of Minho).  All rights reserved.
+
+"""
+This module provides the sliding window composition statistics of a sequence, computed in a single pass over the sequence.
+The counts of the window are kept updated as each base enters and leaves the window (O(1) per base), instead of being counted again for every window:
+    - Counts and percentage of each character of the window
+    - GC content and GC skew
+    - Codon usage of the codons of the first reading frame of the sequence that are entirely inside the window
+The sequence can be given as a string or as an iterable of chunks (str or bytes), so streamed or mapped sequences are never held in memory.
+"""
+
+from collections import namedtuple
+
+Window = namedtuple("Window", ["start", "end", "counts", "percentages", "gc", "gc_skew", "codons"])
+Window.__doc__ = '''Statistics of a window [start, end) of the sequence: counts and percentages of each character, GC content, GC skew and codon usage (None if not asked)'''
+
+_BASE_CODES = bytes({65: 0, 67: 1, 71: 2, 84: 3}.get(c, 4) for c in range(256))
+_CODONS = [a + b + c for a in "ACGT" for b in "ACGT" for c in "ACGT"]
+
+
+def sliding_windows(source, window: int, step: int = None, codons: bool = False):
+    '''Generator of the statistics of the windows of "window" characters, starting every "step" characters.
+    Only the complete windows are reported
+
+    Parameters
+    ----------
+    source : str, bytes or iterable
+        Sequence or iterable of chunks of the sequence (str or bytes)
+    window : int
+        Size of the windows
+    step : int, optional
+        Distance between the start of consecutive windows, by default equal to the window (non overlapping windows)
+    codons : bool, optional
+        If True, the codon usage of each window is also reported, by default False
+
+    Yields
+    ------
+    Window
+        Statistics of each window
+
+    Raises
+    ------
+    ValueError
+        If the window or the step are not positive (or the window is smaller than a codon when the codon usage is asked)
+    '''
+    if step is None:
+        step = window
+    if window < 1 or step < 1 or (codons and window < 3):
+        raise ValueError("Window and step must be positive (and the window at least 3 for codon usage)")
+    if isinstance(source, (str, bytes, bytearray)):
+        source = (source,)
+    counts = [0]*256
+    seen = []                                               # Caracteres já encontrados, para não percorrer os 256 contadores por janela
+    ring = bytearray(window)                                # Últimos "window" caracteres (buffer circular)
+    usage = [0]*64
+    base = _BASE_CODES
+    p = 0
+    for chunk in source:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("ascii")
+        for c in chunk.upper():
+            r = p % window
+            if p >= window:
+                counts[ring[r]] -= 1
+                s = p - window                              # Posição que sai da janela
+                if codons and s % 3 == 0:
+                    a, b, d = base[ring[r]], base[ring[(s + 1) % window]], base[ring[(s + 2) % window]]
+                    if a < 4 and b < 4 and d < 4:
+                        usage[16*a + 4*b + d] -= 1
+            ring[r] = c
+            if not counts[c] and c not in seen:
+                seen.append(c)
+            counts[c] += 1
+            if codons and p >= 2 and (p - 2) % 3 == 0:
+                a, b, d = base[ring[(p - 2) % window]], base[ring[(p - 1) % window]], base[c]
+                if a < 4 and b < 4 and d < 4:
+                    usage[16*a + 4*b + d] += 1
+            p += 1
+            start = p - window
+            if start >= 0 and start % step == 0:
+                yield _window_stats(start, p, counts, seen, usage if codons else None)
+
+
+def _window_stats(start: int, end: int, counts: list, seen: list, usage: list) -> Window:
+    '''Auxiliary function that builds the statistics of a window from the running counts'''
+    size = end - start
+    window_counts = {chr(c): counts[c] for c in seen if counts[c]}
+    g, c = counts[71], counts[67]
+    return Window(start, end, window_counts,
+                  {k: round(v/size, 3)*100 for k, v in window_counts.items()},
+                  (g + c)/size,
+                  (g - c)/(g + c) if g + c else 0.0,
+                  {_CODONS[i]: n for i, n in enumerate(usage) if n} if usage is not None else None)
@@ -1,4 +1,4 @@
 # __init__.py
 
-import Automata, BoyerMoore, BWT, debruijn, EAMotifs, EvolAlgorithm, Indiv, MetabolicNetwork, MotifFinding, Motifs, MyGraph, overlap_graphs, Popul, Sequence, trie
+import Automata, BoyerMoore, BWT, debruijn, EAMotifs, EvolAlgorithm, ExternalBWT, GeneticCode, Indiv, Kmers, MappedSequence, MetabolicNetwork, MotifFinding, Motifs, MultiBWT, MyGraph, overlap_graphs, PackedSequence, ParallelTranslation, Popul, RankStructures, ReadAligner, SeqReader, Sequence, SequenceBatch, SuffixArray, trie, WindowStats
 
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 by Group 7 (MSc Bioinformatics - University of Minho).  All rights reserved.
+
+"""
+Benchmark of the sampled suffix array of :class:`BWT`: memory of the samples against the latency of locate queries,
+for several sampling rates (1 keeps the whole suffix array).
+
+Usage: python benchmarks/bench_bwt_locate.py [length] [queries] [pattern length]
+"""
+
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from BWT import BWT
+
+RATES = (1, 4, 16, 32, 64, 128)
+
+
+def main(length: int = 200000, queries: int = 2000, m: int = 12):
+    random.seed(0)
+    seq = "".join(random.choice("ACGT") for _ in range(length))
+    pats = [seq[i:i + m] for i in random.sample(range(length - m), queries)]
+    print(f"sequence length: {length} bp, {queries} queries of {m} bp")
+    print(f"{'rate':>6} {'samples (bytes)':>16} {'bytes/base':>11} {'locate (us/query)':>18}")
+    for rate in RATES:
+        index = BWT(seq, sa_sample = rate)
+        size = index._sa_rows.itemsize*len(index._sa_rows) + index._sa_values.itemsize*len(index._sa_values)
+        t = min(timeit.repeat(lambda: [index.locate(p) for p in pats], number = 1, repeat = 3))
+        print(f"{rate:>6} {size:>16} {size / length:>11.2f} {1e6*t / queries:>18.1f}")
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:4]])
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 by Group 7 (MSc Bioinformatics - University of Minho).  All rights reserved.
+
+"""
+Benchmark of :class:`ReadAligner`: throughput of the alignment of simulated reads (with substitutions and small indels, on both strands)
+for several numbers of worker processes, and the fraction of reads aligned at their origin.
+
+Usage: python benchmarks/bench_read_aligner.py [length] [reads] [read length]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from BWT import BWT
+from ReadAligner import ReadAligner
+
+PROCESSES = (None, 2, 4, 8)
+_COMPLEMENT = str.maketrans("ACGT", "TGCA")
+
+
+def simulate(ref: str, n: int, m: int) -> list:
+    '''Reads of m bases with 1% substitutions and an indel in a third of them, half of them in the reverse strand'''
+    reads = []
+    for k in range(n):
+        a = random.randrange(len(ref) - m - 5)
+        r = list(ref[a:a + m])
+        for i in random.sample(range(m), m // 100):
+            r[i] = random.choice("ACGT")
+        if k % 3 == 1:
+            del r[m // 2:m // 2 + random.randint(1, 3)]
+        elif k % 3 == 2:
+            r[m // 2:m // 2] = random.choices("ACGT", k = random.randint(1, 3))
+        r = "".join(r)
+        reads.append((a, r if k % 2 else r.translate(_COMPLEMENT)[::-1]))
+    return reads
+
+
+def main(length: int = 1000000, n: int = 2000, m: int = 150):
+    random.seed(0)
+    ref = "".join(random.choice("ACGT") for _ in range(length))
+    reads = simulate(ref, n, m)
+    t = time.perf_counter()
+    aligner = ReadAligner(BWT(ref))
+    aligner._candidates("ACGT")                                     # Índice da sequência invertida construído antes da medição
+    print(f"reference: {length} bp (index built in {time.perf_counter() - t:.1f} s), {n} reads of {m} bp, {os.cpu_count()} CPUs")
+    print(f"{'processes':>9} {'reads/s':>9} {'at origin':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "reads.fa")
+        with open(path, "w") as handle:
+            for k, (_, r) in enumerate(reads):
+                handle.write(f">r{k}\n{r}\n")
+        for processes in PROCESSES:
+            t = time.perf_counter()
+            res = list(aligner.align_file(path, processes = processes))
+            t = time.perf_counter() - t
+            hits = sum(a.position is not None and abs(a.position - origin) <= 3 for a, (origin, _) in zip(res, reads))
+            print(f"{processes or 1:>9} {n / t:>9.0f} {hits / n:>10.1%}")
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:4]])
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+# Copyright 2022 by Group 7 (MSc Bioinformatics - University of Minho).  All rights reserved.
+
+"""
+Benchmark of the codon translation of :class:`Sequence` against the previous implementation,
+which scanned the whole amino acid dictionary for every codon.
+
+Usage: python benchmarks/bench_translation.py [length] [repeats]
+"""
+
+import os
+import random
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from Sequence import Sequence
+
+AMINO_CODONS = {"F":["TTT", "TTC"], "L":["TTA", "TTG", "CTT", "CTC", "CTA", "CTG"], "I":["ATT", "ATC", "ATA"], "M":"ATG", "V":["GTT", "GTC", "GTA", "GTG"], "S":["TCT", "TCC", "TCA", "TCG", "AGT", "AGC"], "P":["CCT", "CCC", "CCA", "CCG"], "T":["ACT", "ACC", "ACA", "ACG"], "A":["GCT", "GCC", "GCA", "GCG"], "Y":["TAT", "TAC"], "_":["TAA", "TAG", "TGA"], "H":["CAT", "CAC"], "Q":["CAA", "CAG"], "N":["AAT", "AAC"], "K":["AAA", "AAG"], "D":["GAT", "GAC"], "E":["GAA", "GAG"], "C":["TGT", "TGC"], "W":"TGG", "R":["CGT", "CGC", "CGA", "CGG", "AGA", "AGG"], "G":["GGT", "GGC", "GGA", "GGG"]}
+
+
+def legacy_translation(seq: str) -> str:
+    '''Previous implementation of Sequence.translation'''
+    aa = ""
+    for codon in re.findall("(...)", seq):
+        for amino, codoes in AMINO_CODONS.items():
+            if codon in codoes:
+                aa += amino
+    return aa
+
+
+def main(length: int = 1000000, repeats: int = 3):
+    random.seed(0)
+    seq = Sequence("".join(random.choice("ACGT") for _ in range(length)))
+    assert legacy_translation(seq.seq) == seq.translation()
+    legacy = min(timeit.repeat(lambda: legacy_translation(seq.seq), number=1, repeat=repeats))
+    lookup = min(timeit.repeat(seq.translation, number=1, repeat=repeats))
+    six = min(timeit.repeat(seq.get_aa_orfs, number=1, repeat=repeats))
+    print(f"sequence length:        {length} bp")
+    print(f"legacy translation:     {legacy:.4f} s")
+    print(f"codon table lookup:     {lookup:.4f} s  ({legacy / lookup:.1f}x)")
+    print(f"six frames (get_aa_orfs): {six:.4f} s")
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:3]])